@@ -0,0 +1,165 @@
+"""
+asyncio front end for the Rv3028 real time clock.
+
+Bus access is short and is performed directly; EEPROM cycles (which take milliseconds) are awaited
+cooperatively so other tasks keep running while the EEPROM is busy.
+"""
+
+import asyncio
+
+from rv3028.registers import EECMD, Status
+from rv3028.rv3028 import _RV3028_DEFAULT_ADDRESS, RV3028
+
+
+def _bus_method(name):
+    async def method(self, *args, **kwargs):
+        return getattr(self.rtc, name)(*args, **kwargs)
+
+    return method
+
+
+class _InterruptStream:
+    """
+    Async iterator returned by AsyncRV3028.interrupts().
+    """
+
+    def __init__(self, rtc, flags, poll_interval):
+        self._rtc = rtc
+        self._flags = flags
+        self._poll_interval = poll_interval
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        rtc = self._rtc
+        while True:
+            if rtc._int_pin is None or rtc._interrupt_pending():
+                taken = rtc._take_flags(self._flags) & self._flags
+                if taken:
+                    return taken
+            await asyncio.sleep(self._poll_interval)
+
+
+class AsyncRV3028:
+    """
+    Awaitable version of the RV3028 public API. The synchronous driver is available as `rtc` for
+    anything not mirrored here.
+
+    Mirrored as coroutines with the same arguments and results: set_time, get_time, set_date,
+    get_date, set_datetime, get_datetime, set_unix_time, get_unix_time, set_alarm, get_alarm,
+    check_alarm, start_countdown_timer, stop_countdown_timer, get_timer_remaining, check_timer,
+    configure_update_interrupt, check_update, service_interrupts, configure_evi,
+    get_event_timestamp, check_event_flag and check_backup_switchover.
+
+    Example Usage:
+        rtc = AsyncRV3028(i2c)
+        await rtc.configure_backup_switchover(mode="level")
+        async for flags in rtc.interrupts(Status.ALARM):
+            ...
+    """
+
+    def __init__(
+        self,
+        i2c,
+        address: int = _RV3028_DEFAULT_ADDRESS,
+        cache: bool = False,
+        lock=None,
+        stats: bool = False,
+    ):
+        """
+        Args:
+            i2c, address, cache, lock, stats: As for RV3028, which is constructed with them.
+        """
+        self.rtc = RV3028(i2c, address, cache=cache, lock=lock, stats=stats)
+        # Only one EEPROM command may be in progress, so tasks take turns
+        self._eeprom_lock = asyncio.Lock()
+
+    set_time = _bus_method("set_time")
+    get_time = _bus_method("get_time")
+    set_date = _bus_method("set_date")
+    get_date = _bus_method("get_date")
+    set_datetime = _bus_method("set_datetime")
+    get_datetime = _bus_method("get_datetime")
+    set_unix_time = _bus_method("set_unix_time")
+    get_unix_time = _bus_method("get_unix_time")
+    set_alarm = _bus_method("set_alarm")
+    get_alarm = _bus_method("get_alarm")
+    check_alarm = _bus_method("check_alarm")
+    start_countdown_timer = _bus_method("start_countdown_timer")
+    stop_countdown_timer = _bus_method("stop_countdown_timer")
+    get_timer_remaining = _bus_method("get_timer_remaining")
+    check_timer = _bus_method("check_timer")
+    configure_update_interrupt = _bus_method("configure_update_interrupt")
+    check_update = _bus_method("check_update")
+    service_interrupts = _bus_method("service_interrupts")
+    configure_evi = _bus_method("configure_evi")
+    get_event_timestamp = _bus_method("get_event_timestamp")
+    check_event_flag = _bus_method("check_event_flag")
+    check_backup_switchover = _bus_method("check_backup_switchover")
+
+    def on_interrupt(self, flag: Status, callback) -> None:
+        """
+        Register a handler for service_interrupts(). See RV3028.on_interrupt().
+        """
+        self.rtc.on_interrupt(flag, callback)
+
+    def attach_interrupt_pin(self, pin) -> None:
+        """
+        Attach the INT pin used to skip idle STATUS reads. See RV3028.attach_interrupt_pin().
+        """
+        self.rtc.attach_interrupt_pin(pin)
+
+    async def eecommand(self, command: EECMD) -> None:
+        """
+        Run an EEPROM command, yielding to other tasks while the EEPROM is busy. Commands from
+        concurrent tasks run one after the other.
+        """
+        async with self._eeprom_lock:
+            await self.rtc.start_eecommand(command).wait()
+
+    async def apply_eeprom_config(
+        self,
+        trickle=None,
+        backup: str = None,
+        backup_interrupt: bool = None,
+        clkout: int = None,
+        offset: int = None,
+    ) -> bool:
+        """
+        Apply EEPROM backed settings with at most one cooperative EEPROM update.
+        See RV3028.apply_eeprom_config().
+        """
+        # Hold the EEPROM lock from staging to the end of the update, so another task can neither
+        # restage the configuration RAM nor re-enable the refresh in between
+        async with self._eeprom_lock:
+            if not self.rtc._stage_eeprom_config(
+                trickle, backup, backup_interrupt, clkout, offset
+            ):
+                return False
+            await self.rtc.start_eecommand(EECMD.UPDATE).wait()
+            return True
+
+    async def enable_trickle_charger(self, resistance=3000):
+        await self.apply_eeprom_config(trickle=resistance)
+
+    async def disable_trickle_charger(self):
+        await self.apply_eeprom_config(trickle=False)
+
+    async def configure_backup_switchover(self, mode="level", interrupt=False):
+        await self.apply_eeprom_config(backup=mode, backup_interrupt=interrupt)
+
+    def interrupts(
+        self, flags: int = Status.ALARM | Status.EVENT, poll_interval: float = 0.01
+    ) -> _InterruptStream:
+        """
+        Iterate over interrupts with `async for`. Each iteration waits until at least one of `flags`
+        is set, clears those flags with a single write and yields them as a Status bit mask.
+        While an INT pin is attached (see attach_interrupt_pin()), STATUS is only read when the pin
+        reports a pending interrupt.
+
+        Args:
+            flags (int): (Default: Status.ALARM | Status.EVENT) The Status flags to wait for.
+            poll_interval (float): (Default: 0.01) Seconds to sleep between checks.
+        """
+        return _InterruptStream(self.rtc, flags, poll_interval)
@@ -0,0 +1,50 @@
+"""
+Table driven BCD codec for the RV-3028-C7 time and date registers.
+
+The lookup tables are immutable bytes objects built once at import, so converting a register
+costs a single subscript instead of a method call plus arithmetic.
+"""
+
+# Decoded value of every possible register byte. Invalid nibbles decode the same way the
+# arithmetic conversion would (e.g. 0x1A -> 20).
+BCD_DECODE = bytes((value & 0x0F) + (value >> 4) * 10 for value in range(256))
+
+# BCD encoding of every value that fits in two BCD digits (0-99).
+BCD_ENCODE = bytes(((value // 10) << 4) | (value % 10) for value in range(100))
+
+
+def bcd_to_int(bcd: int) -> int:
+    """
+    Decode one BCD register byte (0x00-0xFF).
+    """
+    return BCD_DECODE[bcd]
+
+
+def int_to_bcd(value: int) -> int:
+    """
+    Encode one value (0-99) as a BCD register byte.
+    """
+    if value < 0 or value > 99:
+        raise ValueError(f"Value {value} cannot be encoded as two BCD digits")
+    return BCD_ENCODE[value]
+
+
+def decode_bcd_into(src, dst, start: int = 0, end: int = None) -> None:
+    """
+    Decode src[start:end] into dst[start:end] without allocating. src and dst may be the same buffer.
+    """
+    if end is None:
+        end = len(src)
+    for i in range(start, end):
+        dst[i] = BCD_DECODE[src[i]]
+
+
+def encode_bcd_into(src, dst, start: int = 0, end: int = None) -> None:
+    """
+    Encode src[start:end] (values 0-99) into dst[start:end] without allocating.
+    src and dst may be the same buffer.
+    """
+    if end is None:
+        end = len(src)
+    for i in range(start, end):
+        dst[i] = BCD_ENCODE[src[i]]
@@ -0,0 +1,110 @@
+"""
+Descriptors for register bit fields of the RV-3028-C7 RTC module.
+
+Each descriptor is declared once as a class attribute with a register and a mask from registers.py.
+The shift and width of the mask are computed when the class is defined, so getting or setting a
+field costs one register read (and one write) with no per call mask decoding. Access goes through
+the driver's _read_register()/_write_register(), so the shadow cache and batch() apply as usual.
+
+Example Usage:
+    class RV3028:
+        timer_enabled = RWBit(Reg.CONTROL1, Control1.TIMER_ENABLE)
+        timer_frequency = RWBits(Reg.CONTROL1, Control1.FREQ_SELECT)
+
+    rtc.timer_frequency = TimerFreq.FREQ_1HZ
+    if rtc.timer_enabled:
+        ...
+"""
+
+
+def _build_mask_shift():
+    table = bytearray(256)
+    for mask in range(1, 256):
+        shift = 0
+        while not (mask >> shift) & 0x01:
+            shift += 1
+        table[mask] = shift
+    return bytes(table)
+
+
+# Position of the lowest set bit of every 8 bit mask (every mask in registers.py), so that field
+# access never has to search for it.
+MASK_SHIFT = _build_mask_shift()
+
+
+class ROBits:
+    """
+    A read only field of one or more bits, read as an int shifted down to bit 0.
+    """
+
+    def __init__(self, register: int, mask: int):
+        if mask <= 0 or mask > 0xFF:
+            raise ValueError("Mask must select bits of a single 8 bit register")
+        self.register = register
+        self.mask = mask
+        self.shift = MASK_SHIFT[mask]
+        self.max_value = mask >> self.shift
+        if self.max_value & (self.max_value + 1):
+            raise ValueError("Mask bits must be contiguous")
+        self.width = 0
+        while self.max_value >> self.width:
+            self.width += 1
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        with obj._bus:
+            return (obj._read_register(self.register)[0] & self.mask) >> self.shift
+
+    def __set__(self, obj, value):
+        raise AttributeError("Read only register field")
+
+
+class RWBits(ROBits):
+    """
+    A read/write field of one or more bits. Values outside the field width raise ValueError.
+    """
+
+    def __set__(self, obj, value):
+        value = int(value)
+        if value < 0 or value > self.max_value:
+            raise ValueError(f"Value {value} does not fit in the mask {self.mask:#04x}")
+        # Hold the bus so nothing can change the register between the read and the write
+        with obj._bus:
+            data = obj._read_register(self.register)[0]
+            data = (data & ~self.mask) | (value << self.shift)
+            obj._write_register(self.register, bytes([data]))
+
+
+class ROBit(ROBits):
+    """
+    A read only single bit, read as a bool.
+    """
+
+    def __init__(self, register: int, mask: int):
+        super().__init__(register, mask)
+        if self.width != 1:
+            raise ValueError("ROBit mask must select a single bit")
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        with obj._bus:
+            return bool(obj._read_register(self.register)[0] & self.mask)
+
+
+class RWBit(RWBits):
+    """
+    A read/write single bit, read as a bool. Accepts True/False or 1/0.
+    """
+
+    def __init__(self, register: int, mask: int):
+        super().__init__(register, mask)
+        if self.width != 1:
+            raise ValueError("RWBit mask must select a single bit")
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        with obj._bus:
+            return bool(obj._read_register(self.register)[0] & self.mask)
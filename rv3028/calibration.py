@@ -0,0 +1,100 @@
+"""
+Drift estimation and EEOffset aging compensation for the Rv3028 real time clock.
+
+Pairs of (RTC time, reference time) are fitted with a running least squares estimator. The fitted
+drift is converted into a correction of the 9 bit EEOffset value, which is persisted with a single
+EEPROM update.
+"""
+
+# Frequency correction per EEOffset step, in ppm (see FREQUENCY OFFSET COMPENSATION in the datasheet)
+OFFSET_STEP_PPM = 0.9537
+
+_OFFSET_MIN = -256
+_OFFSET_MAX = 255
+
+
+class DriftCalibrator:
+    """
+    Estimates how fast the RTC runs against a reference clock and corrects it through EEOffset.
+
+    Times should be passed as integers (e.g. Unix seconds) so that no precision is lost to the
+    limited float precision of CircuitPython; only differences are converted to floats.
+
+    Example Usage:
+        calibrator = DriftCalibrator(rtc)
+        calibrator.sample(gps_unix_time)  # Repeated over days
+        ...
+        calibrator.apply()
+    """
+
+    def __init__(self, rtc):
+        self._rtc = rtc
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Discard all recorded samples.
+        """
+        self.count = 0
+        self._origin = None
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._cxx = 0.0
+        self._cxy = 0.0
+
+    def record(self, rtc_time, reference_time) -> None:
+        """
+        Record one pair of simultaneous readings of the RTC and the reference clock, in seconds.
+        """
+        if self._origin is None:
+            self._origin = reference_time
+        # Fit the RTC error against elapsed reference time; its slope is the drift.
+        x = float(reference_time - self._origin)
+        y = float(rtc_time - reference_time)
+
+        # Welford style running update of the means and co-moments
+        self.count += 1
+        dx = x - self._mean_x
+        self._mean_x += dx / self.count
+        self._mean_y += (y - self._mean_y) / self.count
+        self._cxx += dx * (x - self._mean_x)
+        self._cxy += dx * (y - self._mean_y)
+
+    def sample(self, reference_time: int) -> None:
+        """
+        Record the RTC's Unix time counter against the reference time (Unix seconds).
+        """
+        self.record(self._rtc.get_unix_time(), reference_time)
+
+    @property
+    def drift_ppm(self) -> float:
+        """
+        The fitted drift in ppm (positive when the RTC runs fast), or None with too few samples.
+        """
+        if self.count < 2 or self._cxx <= 0:
+            return None
+        return self._cxy / self._cxx * 1000000
+
+    def offset_correction(self) -> int:
+        """
+        Returns:
+            The number of EEOffset steps to add to the current offset to cancel the fitted drift.
+        """
+        drift = self.drift_ppm
+        if drift is None:
+            raise ValueError("At least two samples over a nonzero interval are needed")
+        return round(drift / OFFSET_STEP_PPM)
+
+    def apply(self) -> int:
+        """
+        Add the fitted correction to the device's EEOffset with one EEPROM update, then discard the
+        samples (they were taken with the old offset).
+
+        Returns:
+            int: The new EEOffset value, clamped to -256 to 255.
+        """
+        offset = self._rtc.get_eeprom_offset() + self.offset_correction()
+        offset = max(_OFFSET_MIN, min(_OFFSET_MAX, offset))
+        self._rtc.apply_eeprom_config(offset=offset)
+        self.reset()
+        return offset
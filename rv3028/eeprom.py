@@ -0,0 +1,205 @@
+"""
+Non-blocking EEPROM command engine for the RV-3028-C7 RTC module.
+
+An EEPROM cycle takes milliseconds (tens of milliseconds for an UPDATE). Instead of spinning on the
+EEBUSY flag, EEPROMCommand runs the command sequence as a small state machine that can be advanced
+from a main loop or awaited from asyncio, polling EEBUSY with an exponential back-off.
+"""
+
+import time
+
+from rv3028.registers import EECMD, Control1, Flag, Reg, Status
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+EEPROM_MIRROR_REGISTERS = (Reg.EEPROM_CLKOUT, Reg.EEPROM_OFFSET, Reg.EEPROM_BACKUP)
+
+# Bytes of user EEPROM, at EEPROM addresses 0x00 to 0x2A
+USER_EEPROM_SIZE = 43
+
+# Back-off between EEBUSY polls, in nanoseconds.
+_MIN_BACKOFF_NS = 1000000
+_MAX_BACKOFF_NS = 16000000
+
+# States of the command sequence (see the EECMD register description in the datasheet)
+_ENABLE = 0  # Disable the automatic refresh (EERD = 1)
+_WAIT_IDLE = 1  # Wait for any previous transfer to finish
+_ISSUE = 2  # Write 00h, then the command, to EECMD
+_WAIT_DONE = 3  # Wait for this transfer to finish
+_FINISH = 4  # Re-enable the automatic refresh (EERD = 0)
+_DONE = 5
+_CANCELLED = 6  # Abandoned by cancel() or after an error
+
+
+class EEPROMCommand:
+    """
+    A single EEPROM command in progress. Only one command may be in progress per device: starting
+    another one before this one is done (or cancelled) raises RuntimeError.
+
+    Example Usage:
+        command = rtc.start_eecommand(EECMD.UPDATE)
+        while not command.poll():
+            do_other_work()
+    """
+
+    def __init__(
+        self,
+        rtc,
+        command: EECMD,
+        timeout: float = 1.0,
+        clock=None,
+        address: int = None,
+        data: int = None,
+    ):
+        """
+        Args:
+            rtc (RV3028): The device to run the command on.
+            command (EECMD): The command to run.
+            timeout (float): (Default: 1.0) Seconds to wait for EEBUSY to clear before giving up.
+            clock: Nanosecond tick source. Defaults to time.monotonic_ns.
+            address (int): The user EEPROM address for READ_ONE_BYTE and WRITE_ONE_BYTE.
+            data (int): The byte to write for WRITE_ONE_BYTE.
+        """
+        self.command = command
+        self.address = address
+        self.data = data
+        self.value = None  # The byte read by READ_ONE_BYTE once done
+        self._rtc = rtc
+        self._clock = clock or time.monotonic_ns
+        self._timeout_ns = int(timeout * 1000000000)
+        self._state = _ENABLE
+        self._next_poll = 0
+        self._deadline = 0
+        self._backoff = _MIN_BACKOFF_NS
+
+        with rtc._bus:
+            if rtc._eeprom_command is not None:
+                raise RuntimeError("Another EEPROM command is in progress")
+            rtc._eeprom_command = self
+
+    @property
+    def done(self) -> bool:
+        return self._state == _DONE
+
+    @property
+    def delay(self) -> float:
+        """
+        Seconds until the next EEBUSY poll is due; a good time to sleep before calling poll() again.
+        """
+        return max(0, self._next_poll - self._clock()) / 1000000000
+
+    def step(self) -> bool:
+        """
+        Advance the command by at most one bus operation, unless the back-off period has not passed.
+
+        Returns:
+            True once the command has completed, False otherwise.
+        """
+        state = self._state
+        if state == _DONE:
+            return True
+        if state == _CANCELLED:
+            raise RuntimeError("EEPROM command was cancelled")
+        now = self._clock()
+        if now < self._next_poll:
+            return False
+
+        # Each step is a compound operation, but the bus is free while waiting between steps
+        with self._rtc._bus:
+            try:
+                self._advance(state, now)
+            except BaseException:
+                # Never leave the automatic refresh disabled or the device claimed
+                self.cancel()
+                raise
+        return self._state == _DONE
+
+    def cancel(self) -> None:
+        """
+        Abandon the command: re-enable the automatic refresh and let another command start.
+        A command already issued to the EEPROM still completes on the device.
+        """
+        if self._state == _DONE or self._state == _CANCELLED:
+            return
+        self._state = _CANCELLED
+        rtc = self._rtc
+        with rtc._bus:
+            rtc._eeprom_command = None
+            rtc._set_flag(Reg.CONTROL1, Control1.EEPROM_REFRESH_DISABLE, Flag.CLEAR)
+
+    def _advance(self, state, now):
+        rtc = self._rtc
+        if state == _ENABLE:
+            rtc._set_flag(Reg.CONTROL1, Control1.EEPROM_REFRESH_DISABLE, Flag.SET)
+            self._deadline = now + self._timeout_ns
+            self._state = _WAIT_IDLE
+        elif state == _WAIT_IDLE or state == _WAIT_DONE:
+            if rtc._get_flag(Reg.STATUS, Status.EEBUSY):
+                if now >= self._deadline:
+                    raise RuntimeError("Timed out waiting for the EEPROM")
+                self._next_poll = now + self._backoff
+                self._backoff = min(self._backoff * 2, _MAX_BACKOFF_NS)
+                return
+            self._state = _ISSUE if state == _WAIT_IDLE else _FINISH
+        elif state == _ISSUE:
+            if self.command == EECMD.WRITE_ONE_BYTE:
+                # EEADDR and EEDATA are adjacent
+                rtc._write_register(Reg.EEADDR, bytes([self.address, self.data]))
+            elif self.command == EECMD.READ_ONE_BYTE:
+                rtc._write_register(Reg.EEADDR, bytes([self.address]))
+            # First command must be 00h
+            rtc._write_register(Reg.EECMD, bytes([EECMD.RESET]))
+            rtc._write_register(Reg.EECMD, bytes([self.command]))
+            # The EEPROM is busy right after the command, so do not poll straight away.
+            self._backoff = _MIN_BACKOFF_NS
+            self._next_poll = now + self._backoff
+            self._deadline = now + self._timeout_ns
+            self._state = _WAIT_DONE
+        elif state == _FINISH:
+            if self.command == EECMD.READ_ONE_BYTE:
+                self.value = rtc._read_register(Reg.EEDATA)[0]
+            rtc._set_flag(Reg.CONTROL1, Control1.EEPROM_REFRESH_DISABLE, Flag.CLEAR)
+            if self.command == EECMD.REFRESH:
+                # The configuration RAM has been reloaded from the EEPROM.
+                for register in EEPROM_MIRROR_REGISTERS:
+                    rtc.invalidate_cache(register)
+            rtc._eeprom_command = None
+            self._state = _DONE
+
+    def poll(self) -> bool:
+        """
+        Advance the command as far as possible without waiting.
+
+        Returns:
+            True once the command has completed, False otherwise.
+        """
+        while not self.step():
+            if self._clock() < self._next_poll:
+                return False
+        return True
+
+    def run(self) -> None:
+        """
+        Run the command to completion, sleeping between EEBUSY polls.
+        """
+        try:
+            while not self.poll():
+                time.sleep(self.delay)
+        except BaseException:
+            self.cancel()
+            raise
+
+    async def wait(self) -> None:
+        """
+        Run the command to completion, yielding to other asyncio tasks between EEBUSY polls.
+        The command is cancelled if the awaiting task is.
+        """
+        try:
+            while not self.poll():
+                await asyncio.sleep(self.delay)
+        except BaseException:
+            self.cancel()
+            raise
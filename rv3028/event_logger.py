@@ -0,0 +1,204 @@
+"""
+Hardware timestamped event logger for the Rv3028 real time clock.
+
+Every EVENT (or backup switchover) interrupt drains the timestamp registers into a preallocated ring
+buffer and resets them, so events are not lost between polls and logging an event does not allocate.
+"""
+
+import time
+
+from rv3028.bcd import BCD_DECODE
+from rv3028.registers import Control2, EventControl, Flag, Reg, Status
+
+# Bytes per entry: year, month, date, hours, minutes, seconds, count
+_ENTRY_SIZE = 7
+
+
+class EventLogger:
+    """
+    Ring buffer of event timestamps, filled from the interrupt handler registered by start().
+
+    Each entry is a tuple (year, month, date, hours, minutes, seconds, count) where count is the
+    number of events the device counted since the previous entry. Only one of those events (the first,
+    or the last in overwrite mode) is timestamped.
+
+    Example Usage:
+        logger = EventLogger(rtc, capacity=32)
+        logger.start()
+        while True:
+            rtc.service_interrupts()
+            while len(logger):
+                log(logger.pop())
+    """
+
+    def __init__(
+        self,
+        rtc,
+        capacity: int = 16,
+        overwrite: bool = False,
+        source: str = "evi",
+        clock=None,
+    ):
+        """
+        Args:
+            rtc (RV3028): The device to log events from.
+            capacity (int): (Default: 16) Number of entries kept before the oldest is overwritten.
+            overwrite (bool): (Default: False) False to timestamp the first event since the previous
+                entry, True to timestamp the last one.
+            source (str): (Default: 'evi') 'evi' to timestamp events on the EVI pin, 'backup' to
+                timestamp switchovers to the backup supply.
+            clock: Nanosecond tick source used for event_rate(). Defaults to time.monotonic_ns.
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        if source not in ("evi", "backup"):
+            raise ValueError("Invalid source. Use 'evi' or 'backup'.")
+
+        self._rtc = rtc
+        self._capacity = capacity
+        self._overwrite = overwrite
+        self._source = source
+        self._clock = clock or time.monotonic_ns
+        self._entries = bytearray(capacity * _ENTRY_SIZE)
+        self._head = 0  # Index of the oldest entry
+        self._length = 0
+        self._event_interrupt = False  # Whether start() enabled the event interrupt
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """
+        Reset the event statistics.
+        """
+        self.captured = 0  # Entries recorded
+        self.events = 0  # Events counted by the device
+        self.dropped = 0  # Entries overwritten because the buffer was full
+        self._started = self._clock()
+
+    def event_rate(self) -> float:
+        """
+        Returns:
+            The number of events per second since construction or the last reset_stats().
+        """
+        elapsed = self._clock() - self._started
+        if elapsed <= 0:
+            return 0.0
+        return self.events * 1000000000 / elapsed
+
+    @property
+    def flag(self) -> int:
+        """
+        The Status flag that signals a new timestamp for the configured source.
+        """
+        return Status.BACKUP_SWITCH if self._source == "backup" else Status.EVENT
+
+    def start(self) -> None:
+        """
+        Configure time stamping, reset the timestamp registers and register capture() as the
+        interrupt handler (see RV3028.on_interrupt() and RV3028.service_interrupts()).
+        For the 'evi' source the event interrupt is also enabled on the INT pin; use
+        RV3028.configure_evi() to select the edge and filter. For the 'backup' source the backup
+        switchover interrupt is enabled with RV3028.configure_backup_switchover(interrupt=True).
+        """
+        rtc = self._rtc
+        with rtc.batch():
+            rtc._set_flag(
+                Reg.EVENT_CONTROL, EventControl.TIMESTAMP_OVERWRITE, self._overwrite
+            )
+            rtc._set_flag(
+                Reg.EVENT_CONTROL,
+                EventControl.TIMESTAMP_SOURCE_SELECT,
+                self._source == "backup",
+            )
+            rtc._set_flag(Reg.EVENT_CONTROL, EventControl.TIMESTAMP_RESET, Flag.SET)
+            rtc._set_flag(Reg.CONTROL2, Control2.TIMESTAMP_ENABLE, Flag.SET)
+            if self._source == "evi":
+                rtc._set_flag(Reg.CONTROL2, Control2.EVENT_INT_ENABLE, Flag.SET)
+        self._event_interrupt = self._source == "evi"
+        rtc.on_interrupt(self.flag, self.capture)
+
+    def stop(self) -> None:
+        """
+        Disable time stamping (and the event interrupt, if start() enabled it) and unregister the
+        interrupt handler. Logged entries are kept.
+        """
+        rtc = self._rtc
+        rtc.on_interrupt(self.flag, None)
+        # Nobody clears the EVENT flag any more, so it must not keep asserting INT
+        with rtc.batch():
+            rtc._set_flag(Reg.CONTROL2, Control2.TIMESTAMP_ENABLE, Flag.CLEAR)
+            if self._event_interrupt:
+                rtc._set_flag(Reg.CONTROL2, Control2.EVENT_INT_ENABLE, Flag.CLEAR)
+        self._event_interrupt = False
+
+    def capture(self) -> bool:
+        """
+        Read the timestamp registers with one burst read, append them to the buffer and reset them.
+        Called from the interrupt handler; may also be called directly when polling.
+
+        Returns:
+            True if a timestamp was recorded, False if no event was pending.
+        """
+        rtc = self._rtc
+        data = rtc._rx
+        with rtc._bus:
+            rtc._read_into(Reg.TIMESTAMP_COUNT, data, _ENTRY_SIZE)
+            count = data[0]
+            if not count:
+                return False
+            self._append(data, count)
+            rtc._set_flag(Reg.EVENT_CONTROL, EventControl.TIMESTAMP_RESET, Flag.SET)
+
+        self.captured += 1
+        self.events += count
+        return True
+
+    def _append(self, data, count):
+        if self._length == self._capacity:
+            self._head = (self._head + 1) % self._capacity
+            self._length -= 1
+            self.dropped += 1
+        offset = ((self._head + self._length) % self._capacity) * _ENTRY_SIZE
+        entries = self._entries
+        entries[offset] = BCD_DECODE[data[6]]  # year
+        entries[offset + 1] = BCD_DECODE[data[5]]  # month
+        entries[offset + 2] = BCD_DECODE[data[4]]  # date
+        entries[offset + 3] = BCD_DECODE[data[3]]  # hours
+        entries[offset + 4] = BCD_DECODE[data[2]]  # minutes
+        entries[offset + 5] = BCD_DECODE[data[1]]  # seconds
+        entries[offset + 6] = count
+        self._length += 1
+
+    def __len__(self) -> int:
+        return self._length
+
+    def pop_into(self, buffer) -> bool:
+        """
+        Remove the oldest entry and copy it into `buffer` (at least 7 items) without allocating.
+
+        Returns:
+            True if an entry was copied, False if the buffer is empty.
+        """
+        if not self._length:
+            return False
+        offset = self._head * _ENTRY_SIZE
+        for i in range(_ENTRY_SIZE):
+            buffer[i] = self._entries[offset + i]
+        self._head = (self._head + 1) % self._capacity
+        self._length -= 1
+        return True
+
+    def pop(self) -> tuple:
+        """
+        Remove and return the oldest entry as (year, month, date, hours, minutes, seconds, count).
+        """
+        entry = bytearray(_ENTRY_SIZE)
+        if not self.pop_into(entry):
+            raise IndexError("pop from empty event log")
+        return tuple(entry)
+
+    def clear(self) -> None:
+        """
+        Discard all logged entries.
+        """
+        self._head = 0
+        self._length = 0
@@ -0,0 +1,255 @@
+"""
+Monotonic high resolution wall clock fused from the Rv3028 seconds and the MCU tick counter.
+
+The RTC is read at a second boundary to anchor the MCU tick counter to wall clock time. After that,
+timestamps are computed from the tick counter alone (no I2C traffic), corrected for the measured
+drift of the MCU clock against the RTC. Periodic resyncs are spread over calls to time_ns() (one
+single register read per poll interval), and any correction they bring is slewed in gradually so
+the clock never steps backwards. The exception is a step of the RTC time itself (e.g. set_datetime()
+or a GPS correction): an anchor more than a second away from the estimate restarts the drift
+estimate and steps the clock to the new time.
+"""
+
+import time
+
+from rv3028.registers import Reg
+from rv3028.timeutils import epoch_seconds
+
+# Minimum RTC time between the first and the latest anchor before the drift estimate is used.
+_MIN_DRIFT_BASELINE_NS = 10000000000
+
+# Rate at which a resync correction is slewed in: 500 ppm, i.e. 0.5 ms per second.
+_SLEW_PPM = 500
+
+# Corrections larger than this are taken to be a step of the RTC time, not drift.
+_STEP_THRESHOLD_NS = 1000000000
+
+# Largest drift estimate accepted: 1000 ppm, well beyond any crystal tolerance.
+_MAX_DRIFT_PPB = 1000000
+
+# A second boundary is only used as an anchor if it was seen within this many poll intervals of
+# the previous read, which bounds the anchor error.
+_MAX_POLL_GAP = 4
+
+
+class FusedClock:
+    """
+    Sub-second wall clock time without RTC reads on the hot path.
+
+    Example Usage:
+        clock = FusedClock(rtc)
+        clock.sync()  # Blocks for up to a second, waiting for the next second boundary
+        timestamp = clock.time_ns()
+
+    Instead of the blocking sync(), the update interrupt can anchor the clock at every second or
+    minute boundary:
+        rtc.configure_update_interrupt(per="minute")
+        rtc.on_interrupt(Status.UPDATE, clock.on_update)
+    """
+
+    def __init__(
+        self,
+        rtc,
+        resync_interval: float = 3600,
+        sync_timeout: float = 1.5,
+        source: str = "calendar",
+        ticks=None,
+        poll_interval: float = 0.001,
+        sleep=None,
+    ):
+        """
+        Args:
+            rtc (RV3028): The device to take wall clock time from.
+            resync_interval (float): (Default: 3600) Seconds after which time_ns() starts watching
+                for a second boundary to resync at. 0 disables automatic resync.
+            sync_timeout (float): (Default: 1.5) Seconds sync() waits for a second boundary.
+            source (str): (Default: 'calendar') 'calendar' to read the calendar registers (as UTC),
+                'unix' to read the Unix time counter.
+            ticks: Nanosecond MCU tick source. Defaults to time.monotonic_ns.
+            poll_interval (float): (Default: 0.001) Seconds between the single register reads that
+                look for a second boundary. The anchor error is at most a few poll intervals.
+            sleep: Function used by sync() to sleep between polls. Defaults to time.sleep.
+        """
+        if source not in ("calendar", "unix"):
+            raise ValueError("Invalid source. Use 'calendar' or 'unix'.")
+
+        self._rtc = rtc
+        self._ticks = ticks or time.monotonic_ns
+        self._sleep = sleep or time.sleep
+        self._resync_interval_ns = int(resync_interval * 1000000000)
+        self._sync_timeout_ns = int(sync_timeout * 1000000000)
+        self._poll_interval = poll_interval
+        self._poll_interval_ns = int(poll_interval * 1000000000)
+        self._source = source
+        # Only the low byte is watched for a change, so polling reads a single register
+        self._poll_register = Reg.UNIX_TIME0 if source == "unix" else Reg.SECONDS
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget the anchor and the drift estimate, e.g. after setting the RTC time. time_ns() raises
+        until the clock is synced again, and may then return less than before.
+        """
+        self._watch = None
+        self._watched_at = 0
+        self._anchor_ticks = None
+        self._anchor_seconds = 0
+        self._origin_ticks = None
+        self._origin_seconds = 0
+        self._drift_ppb = 0
+        self._slew_ns = 0
+        self._slew_ticks = 0
+        self._last_ns = 0
+
+    def resync(self) -> None:
+        """
+        reset() and sync() in one call, for callers that have just set the RTC time.
+        """
+        self.reset()
+        self.sync()
+
+    @property
+    def synced(self) -> bool:
+        return self._anchor_ticks is not None
+
+    @property
+    def drift_ppm(self) -> float:
+        """
+        Measured rate error of the MCU tick counter relative to the RTC, in parts per million
+        (positive when the MCU counter runs fast).
+        """
+        return self._drift_ppb / 1000
+
+    def _read_seconds(self) -> int:
+        rtc = self._rtc
+        if self._source == "unix":
+            return rtc.get_unix_time()
+        dt = rtc.get_datetime()
+        return epoch_seconds(dt[0], dt[1], dt[2], dt[3], dt[4], dt[5])
+
+    def poll(self) -> bool:
+        """
+        Look for a second boundary with at most one single register read, and anchor the tick
+        counter to it once it is seen. Does nothing if called again within the poll interval.
+
+        Returns:
+            True if the clock was anchored by this call, False otherwise.
+        """
+        now = self._ticks()
+        watching = self._watch is not None
+        if watching and now - self._watched_at < self._poll_interval_ns:
+            return False
+
+        with self._rtc._bus:
+            value = self._rtc._read_register(self._poll_register)[0]
+        now = self._ticks()
+        if (
+            watching
+            and value != self._watch
+            and now - self._watched_at <= _MAX_POLL_GAP * self._poll_interval_ns
+        ):
+            # The boundary passed between the previous read and this one
+            self._watch = None
+            self._anchor(self._read_seconds(), (self._watched_at + now) // 2)
+            return True
+        self._watch = value
+        self._watched_at = now
+        return False
+
+    def sync(self) -> None:
+        """
+        Wait for the next RTC second boundary, polling every poll interval, and anchor the tick
+        counter to it.
+        """
+        self._watch = None
+        deadline = self._ticks() + self._sync_timeout_ns
+        while not self.poll():
+            if self._ticks() > deadline:
+                raise RuntimeError("RTC seconds did not advance")
+            self._sleep(self._poll_interval)
+
+    def on_update(self, ticks: int = None) -> None:
+        """
+        Anchor the tick counter at a second boundary that has just passed. Register this as the
+        Status.UPDATE handler (see RV3028.on_interrupt()).
+
+        The boundary is taken to be the time of this call, so any latency between the INT edge and
+        service_interrupts() running the handler shows up as an offset in time_ns() and as jitter in
+        the drift estimate. Pass the tick count captured at the INT edge, if available, to avoid it.
+
+        Args:
+            ticks (int): The MCU tick count at the second boundary. Defaults to the current count.
+        """
+        if ticks is None:
+            ticks = self._ticks()
+        self._anchor(self._read_seconds(), ticks)
+
+    def _anchor(self, seconds: int, ticks: int) -> None:
+        if self._anchor_ticks is not None:
+            offset = self._estimate(ticks) - seconds * 1000000000
+            if -_STEP_THRESHOLD_NS <= offset <= _STEP_THRESHOLD_NS:
+                # Slew from the current estimate to the new anchor instead of stepping
+                self._slew_ns = offset
+                self._slew_ticks = ticks
+            else:
+                # The RTC time was stepped: the old anchors say nothing about drift any more
+                self.reset()
+
+        if self._origin_ticks is None:
+            self._origin_ticks = ticks
+            self._origin_seconds = seconds
+        else:
+            # Estimate drift over the longest baseline available, from the first anchor
+            rtc_elapsed = (seconds - self._origin_seconds) * 1000000000
+            mcu_elapsed = ticks - self._origin_ticks
+            if rtc_elapsed >= _MIN_DRIFT_BASELINE_NS:
+                drift = (mcu_elapsed - rtc_elapsed) * 1000000000 // rtc_elapsed
+                self._drift_ppb = max(-_MAX_DRIFT_PPB, min(drift, _MAX_DRIFT_PPB))
+        self._anchor_ticks = ticks
+        self._anchor_seconds = seconds
+
+    def _estimate(self, now: int) -> int:
+        elapsed = now - self._anchor_ticks
+        elapsed -= elapsed * self._drift_ppb // 1000000000
+        result = self._anchor_seconds * 1000000000 + elapsed
+        if self._slew_ns:
+            remaining = (
+                abs(self._slew_ns) - (now - self._slew_ticks) * _SLEW_PPM // 1000000
+            )
+            if remaining <= 0:
+                self._slew_ns = 0
+            elif self._slew_ns > 0:
+                result += remaining
+            else:
+                result -= remaining
+        return result
+
+    def time_ns(self) -> int:
+        """
+        Returns:
+            Nanoseconds since the epoch, computed from the MCU tick counter. Never decreases, unless
+            the RTC time was stepped (see reset()). Once the resync interval has passed, each call
+            also polls for a second boundary (see poll()), so this never blocks.
+        """
+        if self._anchor_ticks is None:
+            raise RuntimeError("Clock is not synced. Call sync() first.")
+        now = self._ticks()
+        if (
+            self._resync_interval_ns
+            and now - self._anchor_ticks > self._resync_interval_ns
+        ):
+            if self.poll():
+                now = self._ticks()
+
+        result = self._estimate(now)
+        if result < self._last_ns:
+            result = self._last_ns
+        self._last_ns = result
+        return result
+
+    def time(self) -> float:
+        """
+        Returns:
+            Seconds since the epoch as a float. See time_ns().
+        """
+        return self.time_ns() / 1000000000
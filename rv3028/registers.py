@@ -40,6 +40,7 @@ class Reg:
     UNIX_TIME3 = 0x1E
     RAM1 = 0x1F
     RAM2 = 0x20
+    EEADDR = 0x25  # User EEPROM address (0x00 to 0x2A) for EECMD.READ_ONE_BYTE/WRITE_ONE_BYTE
     EEDATA = 0x26
     EECMD = 0x27
     ID = 0x28  # readonly
@@ -103,8 +104,12 @@ class TimerFreq:
     SIZE = 2  # Number of bits used for the frequency selection
     FREQ_4096HZ = 0x00  # Default value
     FREQ_64HZ = 0x01
-    FREQ_1HZ = 0x10
-    FREQ_60S = 0x11
+    FREQ_1HZ = 0x02
+    FREQ_60S = 0x03
+
+
+# Countdown timer tick length in seconds for each TimerFreq value
+TIMER_TICK = (1 / 4096, 1 / 64, 1, 60)
 
 
 class Control2:
@@ -200,7 +205,7 @@ class EEPROMClockOut:
     F = 32.768 kHz.
     """
 
-    FREQ_SELECT: 0x07  # 3 bit flag. Uses the FreqSelect enum for values.
+    FREQ_SELECT = 0x07  # 3 bit flag. Uses the FreqSelect enum for values.
     POR_INT_ENABLE = (
         0x08  # 0: POR interrupt disabled (default). 1: POR interrupt enabled.
     )
@@ -4,20 +4,47 @@ This class handles the Rv3028 real time clock.
 Authors: Nicole Maggard, Michael Pham, and Rachel Sarmiento
 """
 
+import time
+
+from rv3028.bcd import BCD_DECODE, BCD_ENCODE, bcd_to_int, int_to_bcd
+from rv3028.bitfields import MASK_SHIFT, ROBit, ROBits, RWBit, RWBits
+from rv3028.eeprom import USER_EEPROM_SIZE, EEPROMCommand
 from rv3028.registers import (
     BSM,
     EECMD,
+    ID,
+    TIMER_TICK,
     Alarm,
+    ClockIntOn,
     Control1,
     Control2,
     EEPROMBackup,
+    EEPROMClockOut,
     EventControl,
     EventFilter,
     Flag,
+    FreqSelect,
+    GPBits,
     Reg,
     Resistance,
     Status,
+    TimerFreq,
+)
+from rv3028.snapshot import (
+    DEFAULT_RESTORE_FIELDS,
+    FIELD_GROUPS,
+    SNAPSHOT_SIZE,
+    RegisterSnapshot,
 )
+from rv3028.timeutils import DAYS_BEFORE_MONTH, epoch_seconds
+
+try:
+    from _thread import get_ident
+except ImportError:
+
+    def get_ident():
+        return 0
+
 
 try:
     from tests.stubs.i2c_device import I2C, I2CDevice
@@ -27,6 +54,82 @@ except ImportError:
 
 _RV3028_DEFAULT_ADDRESS = 0x52
 
+# Scratch buffer size: the register address plus the longest burst transfer (a full snapshot).
+_BUFFER_SIZE = SNAPSHOT_SIZE + 1
+
+
+def _with_field(value: int, mask: int, field: int) -> int:
+    """
+    Return `value` with the bits under `mask` replaced by `field` (shifted into place).
+    """
+    return (value & ~mask) | ((field * (mask & -mask)) & mask)
+
+
+# Configuration registers that only change when written over the bus (or by an EEPROM refresh),
+# so their contents can be mirrored in memory by the shadow cache.
+_CACHEABLE_REGISTERS = (
+    Reg.CONTROL1,
+    Reg.CONTROL2,
+    Reg.CLOCK_INT_MASK,
+    Reg.EVENT_CONTROL,
+    Reg.EEPROM_CLKOUT,
+    Reg.EEPROM_OFFSET,
+    Reg.EEPROM_BACKUP,
+)
+
+# Bits the device clears by itself after they are written as 1. They are never cached as set.
+_SELF_CLEARING_BITS = {
+    Reg.CONTROL2: Control2.RESET,
+    Reg.EVENT_CONTROL: EventControl.TIMESTAMP_RESET,
+}
+
+# STATUS flags that signal an interrupt source and are cleared by writing 0.
+_INTERRUPT_FLAGS = (
+    Status.PORF
+    | Status.EVENT
+    | Status.ALARM
+    | Status.TIMER
+    | Status.UPDATE
+    | Status.BACKUP_SWITCH
+    | Status.CLOCK_OUTPUT
+)
+
+# Every interrupt that can start the interrupt controlled clock output
+_CLOCK_INTERRUPTS = (
+    ClockIntOn.TIME_UPDATE | ClockIntOn.TIMER | ClockIntOn.ALARM | ClockIntOn.EVENT
+)
+
+# Countdown timer clock selections, fastest first.
+_TIMER_CLOCKS = (
+    TimerFreq.FREQ_4096HZ,
+    TimerFreq.FREQ_64HZ,
+    TimerFreq.FREQ_1HZ,
+    TimerFreq.FREQ_60S,
+)
+_TIMER_MAX_TICKS = 0xFFF  # 12 bit countdown value
+
+# Trickle charger resistance in ohms -> EEPROMBackup.TRICKLE_CHARGE_RES value
+_TRICKLE_RESISTANCE = {
+    3000: Resistance.RES_3000,
+    5000: Resistance.RES_5000,
+    9000: Resistance.RES_9000,
+    15000: Resistance.RES_15000,
+}
+
+# Scratch RAM: 7 GP bits plus RAM1 and RAM2, read with one burst from GP_BITS through RAM2
+SCRATCH_MASK = 0x7FFFFF
+_SCRATCH_SPAN = Reg.RAM2 - Reg.GP_BITS + 1
+
+# Backup switchover mode name -> EEPROMBackup.BACKUP_SWITCHOVER value
+_BACKUP_MODES = {
+    "level": BSM.LEVEL,
+    "direct": BSM.DIRECT,
+    "disabled": BSM.DISABLED,
+}
+
+# Registers whose writes are commands rather than state, so they are never coalesced in a batch.
+_UNBATCHED_REGISTERS = (Reg.STATUS, Reg.EECMD)
+
 
 class WEEKDAY:
     SUNDAY = 0
@@ -38,8 +141,148 @@ class WEEKDAY:
     SATURDAY = 6
 
 
+class _BusTransaction:
+    """
+    Re-entrant context manager that holds the optional driver lock and the I2C device for the
+    duration of a compound operation, so no other user of the bus can interleave with it.
+    Entering it yields the I2C device. With `stats`, lock wait and hold times are recorded for
+    bus_stats(); this is off by default because the timestamps are long ints that allocate on
+    CircuitPython.
+    """
+
+    def __init__(self, device, lock, stats=False):
+        self._device = device
+        self._lock = lock
+        self._stats = stats
+        self._depth = 0
+        self._owner = None
+        self._held_since = 0
+        self.acquisitions = 0
+        self.wait_ns_total = 0
+        self.wait_ns_max = 0
+        self.hold_ns_total = 0
+        self.hold_ns_max = 0
+
+    def __enter__(self):
+        if self._depth and self._owner == get_ident():
+            self._depth += 1
+            return self._device
+
+        if self._stats:
+            start = time.monotonic_ns()
+        if self._lock is not None:
+            self._lock.acquire()
+        try:
+            self._device.__enter__()
+        except BaseException:
+            if self._lock is not None:
+                self._lock.release()
+            raise
+        self._owner = get_ident()
+        self._depth = 1
+
+        if self._stats:
+            self._held_since = time.monotonic_ns()
+            waited = self._held_since - start
+            self.acquisitions += 1
+            self.wait_ns_total += waited
+            if waited > self.wait_ns_max:
+                self.wait_ns_max = waited
+        return self._device
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+        if self._depth:
+            return
+        if self._stats:
+            held = time.monotonic_ns() - self._held_since
+            self.hold_ns_total += held
+            if held > self.hold_ns_max:
+                self.hold_ns_max = held
+        self._owner = None
+        try:
+            self._device.__exit__(exc_type, exc_value, traceback)
+        finally:
+            if self._lock is not None:
+                self._lock.release()
+
+
+class _Batch:
+    """
+    Context manager returned by RV3028.batch(). Batches may be nested; the pending writes are
+    flushed when the outermost batch exits, and discarded if it exits with an exception.
+    The bus is held for the duration of the batch.
+    """
+
+    def __init__(self, rtc):
+        self._rtc = rtc
+
+    def __enter__(self):
+        # Hold the bus for the whole batch so the reads it is based on cannot go stale
+        self._rtc._bus.__enter__()
+        self._rtc._batch_depth += 1
+        return self._rtc
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        rtc = self._rtc
+        rtc._batch_depth -= 1
+        try:
+            if rtc._batch_depth == 0:
+                if exc_type is None:
+                    rtc._flush_batch()
+                else:
+                    rtc._pending.clear()
+        finally:
+            rtc._bus.__exit__(exc_type, exc_value, traceback)
+
+
 class RV3028:
-    def __init__(self, i2c, address: int = _RV3028_DEFAULT_ADDRESS):
+    # Register fields, e.g. `rtc.timer_frequency = TimerFreq.FREQ_1HZ` (see rv3028.bitfields)
+    timer_frequency = RWBits(Reg.CONTROL1, Control1.FREQ_SELECT)
+    timer_enabled = RWBit(Reg.CONTROL1, Control1.TIMER_ENABLE)
+    eeprom_refresh_disabled = RWBit(Reg.CONTROL1, Control1.EEPROM_REFRESH_DISABLE)
+    update_per_minute = RWBit(Reg.CONTROL1, Control1.UPDATE_INT_SELECT)
+    alarm_date_mode = RWBit(Reg.CONTROL1, Control1.WADA)
+    timer_repeat = RWBit(Reg.CONTROL1, Control1.TIMER_REPEAT)
+    twelve_hour_mode = RWBit(Reg.CONTROL2, Control2.HOUR_MODE)
+    event_interrupt_enabled = RWBit(Reg.CONTROL2, Control2.EVENT_INT_ENABLE)
+    alarm_interrupt_enabled = RWBit(Reg.CONTROL2, Control2.ALARM_INT_ENABLE)
+    timer_interrupt_enabled = RWBit(Reg.CONTROL2, Control2.TIMER_INT_ENABLE)
+    update_interrupt_enabled = RWBit(Reg.CONTROL2, Control2.UPDATE_INT_ENABLE)
+    clock_output_interrupt_enabled = RWBit(
+        Reg.CONTROL2, Control2.CLOCK_OUTPUT_INT_ENABLE
+    )
+    timestamp_enabled = RWBit(Reg.CONTROL2, Control2.TIMESTAMP_ENABLE)
+    clock_interrupt_mask = RWBits(Reg.CLOCK_INT_MASK, _CLOCK_INTERRUPTS)
+    event_filter = RWBits(Reg.EVENT_CONTROL, EventControl.EVENT_FILTER)
+    event_rising_edge = RWBit(Reg.EVENT_CONTROL, EventControl.EVENT_HIGH_LOW_SELECT)
+    timestamp_overwrite = RWBit(Reg.EVENT_CONTROL, EventControl.TIMESTAMP_OVERWRITE)
+    power_on_reset = ROBit(Reg.STATUS, Status.PORF)
+    eeprom_busy = ROBit(Reg.STATUS, Status.EEBUSY)
+    hardware_id = ROBits(Reg.ID, ID.HID)
+    version_id = ROBits(Reg.ID, ID.VID)
+
+    def __init__(
+        self,
+        i2c,
+        address: int = _RV3028_DEFAULT_ADDRESS,
+        cache: bool = False,
+        lock=None,
+        stats: bool = False,
+    ):
+        """
+        Args:
+            i2c: The I2C bus or an already constructed I2CDevice for the RTC.
+            address (int): The I2C address of the RTC.
+            cache (bool): (Default: False) True to mirror the configuration registers in memory so that
+                single register reads of them (and the read half of every read-modify-write) cost no
+                bus transaction. Only enable this if nothing else on the bus writes to the RTC.
+            lock: (Default: None) An object with acquire() and release() (e.g. threading.Lock) shared
+                with the other drivers on the bus. It is held, together with the I2C device, for every
+                transfer and across compound operations such as read-modify-writes and batches.
+            stats (bool): (Default: False) True to record the bus lock metrics returned by
+                bus_stats(). Off by default, as timing every transfer allocates on CircuitPython.
+        """
         if isinstance(i2c, I2C):
             self.i2c_device = I2CDevice(i2c, address)
         elif isinstance(i2c, I2CDevice):
@@ -47,16 +290,161 @@ class RV3028:
         else:
             raise TypeError("i2c should be an i2c bus or device!")
 
+        self._bus = _BusTransaction(self.i2c_device, lock, stats)
+        self._shadow = {} if cache else None
+        self._pending = {}
+        self._batch_depth = 0
+        self._batch = _Batch(self)
+        self._eeprom_command = None  # The EEPROMCommand in progress
+
+        # Preallocated scratch buffers so that register access does not allocate.
+        self._tx = bytearray(_BUFFER_SIZE)
+        self._rx = bytearray(_BUFFER_SIZE)
+        self._rx_view = memoryview(self._rx)
+
+        self._interrupt_handlers = {}
+        self._int_pin = None
+        self._flags_left = 0  # Interrupt flags seen set and not cleared since
+
+    def bus_stats(self) -> dict:
+        """
+        Bus lock metrics since construction (or the last reset_bus_stats()). Only recorded when
+        the driver was constructed with stats=True; otherwise every value stays 0.
+
+        Returns:
+            dict: acquisitions (int) is the number of times the bus was taken; wait_ns_total and
+            wait_ns_max (int) measure the time spent waiting for the lock and the I2C bus;
+            hold_ns_total and hold_ns_max (int) measure how long it was then held.
+        """
+        bus = self._bus
+        return {
+            "acquisitions": bus.acquisitions,
+            "wait_ns_total": bus.wait_ns_total,
+            "wait_ns_max": bus.wait_ns_max,
+            "hold_ns_total": bus.hold_ns_total,
+            "hold_ns_max": bus.hold_ns_max,
+        }
+
+    def reset_bus_stats(self) -> None:
+        bus = self._bus
+        bus.acquisitions = 0
+        bus.wait_ns_total = bus.wait_ns_max = 0
+        bus.hold_ns_total = bus.hold_ns_max = 0
+
+    def batch(self) -> _Batch:
+        """
+        Group register writes into as few bus transactions as possible.
+
+        Inside the block, register writes are held in memory (reads see the held values), multiple
+        updates of the same register are merged, and on exit each run of adjacent registers is written
+        with a single burst write. Writes to STATUS and EECMD are never held back.
+
+        Example Usage:
+            with rtc.batch():
+                rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
+                rtc._set_flag(Reg.CONTROL2, Control2.TIMER_INT_ENABLE, Flag.SET)
+        """
+        return self._batch
+
+    def _flush_batch(self):
+        if not self._pending:
+            return
+        registers = sorted(self._pending)
+        start = 0
+        try:
+            for i in range(1, len(registers) + 1):
+                if i == len(registers) or registers[i] != registers[i - 1] + 1:
+                    run = registers[start:i]
+                    self._bus_write(run[0], bytes(self._pending[reg] for reg in run))
+                    start = i
+        finally:
+            # Even if a write fails, staged values must not linger and shadow later reads
+            self._pending.clear()
+
+    def invalidate_cache(self, register: Reg = None) -> None:
+        """
+        Drop cached register contents so that the next read goes to the device.
+
+        Args:
+            register (Reg): The register to invalidate, or None to invalidate the whole cache.
+        """
+        if self._shadow is None:
+            return
+        if register is None:
+            self._shadow.clear()
+        else:
+            self._shadow.pop(register, None)
+
+    def _update_shadow(self, register, data, length):
+        if self._shadow is None:
+            return
+        for offset in range(length):
+            reg = register + offset
+            if reg in _CACHEABLE_REGISTERS:
+                self._shadow[reg] = data[offset] & ~_SELF_CLEARING_BITS.get(reg, 0)
+
+    def _read_into(self, register, buffer, length=1):
+        """
+        Read `length` consecutive registers into the start of `buffer` without allocating.
+        """
+        # Take the bus first: staged writes only exist while the thread holding it is in a batch,
+        # so another thread never sees (or reads around) them.
+        with self._bus as i2c:
+            if self._pending or self._shadow:
+                # Serve the read from staged writes and the cache if they cover every register
+                for offset in range(length):
+                    reg = register + offset
+                    if reg in self._pending:
+                        buffer[offset] = self._pending[reg]
+                    elif self._shadow is not None and reg in self._shadow:
+                        buffer[offset] = self._shadow[reg]
+                    else:
+                        break
+                else:
+                    return
+
+            # Repeated start: register address and read in one transaction, no STOP in between.
+            self._tx[0] = register
+            i2c.write_then_readinto(self._tx, buffer, out_end=1, in_end=length)
+
+            self._update_shadow(register, buffer, length)
+            if self._pending:
+                for offset in range(length):
+                    if register + offset in self._pending:
+                        buffer[offset] = self._pending[register + offset]
+
     def _read_register(self, register, length=1):
-        with self.i2c_device as i2c:
-            i2c.write(bytes([register]))
-            result = bytearray(length)
-            i2c.readinto(result)
-            return result
+        """
+        Read `length` consecutive registers. The result is a view of the driver's scratch buffer and
+        is only valid until the next register read, so callers sharing the bus between threads must
+        read and use it under `with self._bus:`.
+        """
+        self._read_into(register, self._rx, length)
+        return self._rx_view[:length]
 
     def _write_register(self, register: Reg, data: bytes):
-        with self.i2c_device as i2c:
-            i2c.write(bytes([register]) + data)
+        # Take the bus before looking at the batch state: a batch holds the bus for its whole
+        # duration, so once we hold it, any open batch is our own and other threads wait for it.
+        with self._bus:
+            if self._batch_depth and register not in _UNBATCHED_REGISTERS:
+                for offset, value in enumerate(data):
+                    self._pending[register + offset] = value
+                return
+
+            # Keep writes in order if a command register is written mid-batch
+            self._flush_batch()
+            self._bus_write(register, data)
+
+    def _bus_write(self, register, data):
+        length = len(data)
+        tx = self._tx
+        with self._bus as i2c:
+            tx[0] = register
+            for i in range(length):
+                tx[i + 1] = data[i]
+            i2c.write(tx, end=length + 1)
+
+        self._update_shadow(register, data, length)
 
     def _set_flag(self, register, mask, value):
         try:
@@ -64,26 +452,25 @@ class RV3028:
         except Exception:
             raise ValueError("Argument 'value' must be an integer or boolean")
 
-        data = self._read_register(register)[0]
-        data &= ~mask  # Clear the bits
-
-        shift = 0
-        temp_mask = mask
-        while (temp_mask & 0x01) == 0:
-            temp_mask >>= 1
-            shift += 1
-
+        shift = MASK_SHIFT[mask]
         max_value = mask >> shift
         if value < 0 or value > max_value:
             raise ValueError(f"Value {value} does not fit in the mask {mask:#04x}")
 
-        data |= (value << shift) & mask  # Set the bits
+        # Hold the bus so nothing can change the register between the read and the write
+        with self._bus:
+            data = self._read_register(register)[0]
+            data &= ~mask  # Clear the bits
+            data |= (value << shift) & mask  # Set the bits
 
-        self._write_register(register, bytes([data]))
+            self._write_register(register, bytes([data]))
 
-    def _get_flag(self, register, mask, size=0):
-        data = self._read_register(register)[0]
-        result = (data & mask) >> size
+    def _get_flag(self, register, mask, size=None):
+        # The field is always shifted down by its mask; `size` is ignored and only kept so
+        # existing callers keep working.
+        with self._bus:
+            data = self._read_register(register)[0]
+        result = (data & mask) >> MASK_SHIFT[mask]
 
         # Automatically convert to bool if mask is a single bit
         if mask & (mask - 1) == 0:
@@ -91,22 +478,89 @@ class RV3028:
         return result
 
     def _eecommand(self, command: EECMD):
-        while self._get_flag(Reg.STATUS, Status.EEBUSY):
-            pass
-        self._set_flag(Reg.CONTROL1, Control1.EEPROM_REFRESH_DISABLE, Flag.SET)
-        self._set_flag(Reg.STATUS, Status.EEBUSY, Flag.SET)
-        self._write_register(
-            Reg.EECMD, bytes([EECMD.RESET])
-        )  # First command must be 00h
-        self._write_register(Reg.EECMD, bytes([command]))  # Update command
-        self._set_flag(Reg.STATUS, Status.EEBUSY, Flag.CLEAR)
-        self._set_flag(Reg.CONTROL1, Control1.EEPROM_REFRESH_DISABLE, Flag.CLEAR)
+        EEPROMCommand(self, command).run()
+
+    def start_eecommand(self, command: EECMD) -> EEPROMCommand:
+        """
+        Start an EEPROM command without blocking. Advance it with step()/poll() from the main loop,
+        or `await` its wait() method from asyncio code. Only one command may be in progress at a
+        time; RuntimeError is raised if another one has not completed or been cancelled.
+
+        Args:
+            command (EECMD): The command to run, e.g. EECMD.UPDATE or EECMD.REFRESH.
+        Returns:
+            EEPROMCommand: The command in progress.
+        """
+        return EEPROMCommand(self, command)
+
+    def _check_user_eeprom_range(self, address, length):
+        if address < 0 or length < 0 or address + length > USER_EEPROM_SIZE:
+            raise ValueError("User EEPROM addresses must be between 0x00 and 0x2A")
+
+    def read_user_eeprom(self, address: int) -> int:
+        """
+        Read one byte of user EEPROM.
+
+        Args:
+            address (int): The user EEPROM address (0x00 to 0x2A).
+        Returns:
+            int: The stored byte.
+        """
+        self._check_user_eeprom_range(address, 1)
+        command = EEPROMCommand(self, EECMD.READ_ONE_BYTE, address=address)
+        command.run()
+        return command.value
+
+    def write_user_eeprom(self, address: int, value: int) -> None:
+        """
+        Write one byte of user EEPROM. Every write costs an EEPROM cycle, so avoid rewriting bytes
+        that have not changed (see rv3028.user_eeprom.UserEEPROM).
+
+        Args:
+            address (int): The user EEPROM address (0x00 to 0x2A).
+            value (int): The byte to store (0x00 to 0xFF).
+        """
+        self._check_user_eeprom_range(address, 1)
+        if value < 0 or value > 0xFF:
+            raise ValueError("Value must be between 0x00 and 0xFF")
+        EEPROMCommand(self, EECMD.WRITE_ONE_BYTE, address=address, data=value).run()
+
+    def read_user_eeprom_into(self, address: int, buffer, length: int = None) -> None:
+        """
+        Read consecutive bytes of user EEPROM into the start of `buffer`.
+
+        Args:
+            address (int): The first user EEPROM address.
+            buffer: A bytearray (or memoryview) to read into.
+            length (int): The number of bytes to read. Defaults to len(buffer).
+        """
+        if length is None:
+            length = len(buffer)
+        self._check_user_eeprom_range(address, length)
+        for offset in range(length):
+            command = EEPROMCommand(self, EECMD.READ_ONE_BYTE, address=address + offset)
+            command.run()
+            buffer[offset] = command.value
+
+    def write_user_eeprom_block(self, address: int, data) -> None:
+        """
+        Write consecutive bytes of user EEPROM, one EEPROM cycle per byte.
+
+        Args:
+            address (int): The first user EEPROM address.
+            data: The bytes to store.
+        """
+        self._check_user_eeprom_range(address, len(data))
+        for offset, value in enumerate(data):
+            EEPROMCommand(
+                self, EECMD.WRITE_ONE_BYTE, address=address + offset, data=value
+            ).run()
 
     def _bcd_to_int(self, bcd):
-        return (bcd & 0x0F) + ((bcd >> 4) * 10)
+        return bcd_to_int(bcd)
 
     def _int_to_bcd(self, value):
-        return ((value // 10) << 4) | (value % 10)
+        return int_to_bcd(value)
 
     def set_time(self, hours: int, minutes: int, seconds: int) -> None:
         """
@@ -126,9 +580,9 @@ class RV3028:
 
         data = bytes(
             [
-                self._int_to_bcd(seconds),
-                self._int_to_bcd(minutes),
-                self._int_to_bcd(hours),
+                BCD_ENCODE[seconds],
+                BCD_ENCODE[minutes],
+                BCD_ENCODE[hours],
             ]
         )
         self._write_register(Reg.SECONDS, data)
@@ -144,12 +598,29 @@ class RV3028:
                 minutes (int): The minute value (0-59).
                 seconds (int): The second value (0-59).
         """
-        data = self._read_register(Reg.SECONDS, 3)
-        return (
-            self._bcd_to_int(data[2]),  # hours
-            self._bcd_to_int(data[1]),  # minutes
-            self._bcd_to_int(data[0]),  # seconds
-        )
+        with self._bus:
+            data = self._rx
+            self._read_into(Reg.SECONDS, data, 3)
+            return (
+                BCD_DECODE[data[2]],  # hours
+                BCD_DECODE[data[1]],  # minutes
+                BCD_DECODE[data[0]],  # seconds
+            )
+
+    def get_time_into(self, buffer) -> None:
+        """
+        Retrieves the current time from the device into a caller provided buffer without allocating.
+
+        Args:
+            buffer: A writable sequence of at least 3 items (e.g. a bytearray) that receives
+                (hours, minutes, seconds) as in get_time().
+        """
+        with self._bus:
+            data = self._rx
+            self._read_into(Reg.SECONDS, data, 3)
+            buffer[0] = BCD_DECODE[data[2]]  # hours
+            buffer[1] = BCD_DECODE[data[1]]  # minutes
+            buffer[2] = BCD_DECODE[data[0]]  # seconds
 
     def set_date(self, year: int, month: int, date: int, weekday: int) -> None:
         """
@@ -172,10 +643,10 @@ class RV3028:
 
         data = bytes(
             [
-                self._int_to_bcd(weekday),
-                self._int_to_bcd(date),
-                self._int_to_bcd(month),
-                self._int_to_bcd(year),
+                BCD_ENCODE[weekday],
+                BCD_ENCODE[date],
+                BCD_ENCODE[month],
+                BCD_ENCODE[year],
             ]
         )
         self._write_register(
@@ -193,24 +664,195 @@ class RV3028:
                 date (int): The date value (1-31).
                 weekday (int): The day of the week (0-6, where 0 represents Sunday).
         """
-        data = self._read_register(Reg.WEEKDAY, 4)
-        return (
-            self._bcd_to_int(data[3]),  # year
-            self._bcd_to_int(data[2]),  # month
-            self._bcd_to_int(data[1]),  # date
-            self._bcd_to_int(data[0]),  # weekday
+        with self._bus:
+            data = self._rx
+            self._read_into(Reg.WEEKDAY, data, 4)
+            return (
+                BCD_DECODE[data[3]],  # year
+                BCD_DECODE[data[2]],  # month
+                BCD_DECODE[data[1]],  # date
+                BCD_DECODE[data[0]],  # weekday
+            )
+
+    def get_date_into(self, buffer) -> None:
+        """
+        Gets the date of the device into a caller provided buffer without allocating.
+
+        Args:
+            buffer: A writable sequence of at least 4 items (e.g. a bytearray) that receives
+                (year, month, date, weekday) as in get_date().
+        """
+        with self._bus:
+            data = self._rx
+            self._read_into(Reg.WEEKDAY, data, 4)
+            buffer[0] = BCD_DECODE[data[3]]  # year
+            buffer[1] = BCD_DECODE[data[2]]  # month
+            buffer[2] = BCD_DECODE[data[1]]  # date
+            buffer[3] = BCD_DECODE[data[0]]  # weekday
+
+    def set_datetime(self, datetime, sync_unix: bool = False) -> None:
+        """
+        Sets the time and date of the device in a single burst write of registers SECONDS through YEAR.
+
+        Args:
+            datetime: A time.struct_time or compatible tuple
+                (year, month, date, hours, minutes, seconds, weekday, ...) where:
+                year (int): The full year (2000-2099).
+                month (int): The month value (1-12).
+                date (int): The date value (1-31).
+                hours (int): The hour value (0-23 for 24-hour format).
+                minutes (int): The minute value (0-59).
+                seconds (int): The second value (0-59).
+                weekday (int): The day of the week (0-6, where 0 represents Monday, as in struct_time).
+            sync_unix (bool): (Default: False) True to also set the Unix time counter to the same
+                instant (treated as UTC), so that get_unix_time() matches the calendar.
+        """
+        year, month, date, hours, minutes, seconds, weekday = datetime[:7]
+        if year < 2000 or year > 2099:
+            raise ValueError("Year value must be between 2000 and 2099")
+        if month < 1 or month > 12:
+            raise ValueError("Month value must be between 1 and 12")
+        if date < 1 or date > 31:
+            raise ValueError("Date value must be between 1 and 31")
+        if hours < 0 or hours > 23:
+            raise ValueError("Hour value must be between 0 and 23")
+        if minutes < 0 or minutes > 59:
+            raise ValueError("Minute value must be between 0 and 59")
+        if seconds < 0 or seconds > 59:
+            raise ValueError("Second value must be between 0 and 59")
+        if weekday < 0 or weekday > 6:
+            raise ValueError("Weekday value must be between 0 and 6")
+
+        data = bytes(
+            [
+                BCD_ENCODE[seconds],
+                BCD_ENCODE[minutes],
+                BCD_ENCODE[hours],
+                BCD_ENCODE[(weekday + 1) % 7],  # struct_time Monday=0 -> Sunday=0
+                BCD_ENCODE[date],
+                BCD_ENCODE[month],
+                BCD_ENCODE[year - 2000],
+            ]
         )
+        self._write_register(Reg.SECONDS, data)
+
+        if sync_unix:
+            self.set_unix_time(
+                epoch_seconds(year, month, date, hours, minutes, seconds)
+            )
+
+    def get_datetime(self) -> time.struct_time:
+        """
+        Gets the time and date of the device. All seven registers are read in a single burst, so the
+        time and date are always consistent with each other (no rollover between separate reads).
+
+        Returns:
+            time.struct_time: (year, month, date, hours, minutes, seconds, weekday, yearday, isdst) where
+                year is the full year (2000-2099), weekday is 0-6 with 0 representing Monday,
+                yearday is 1-366 and isdst is always -1.
+        """
+        with self._bus:
+            data = self._rx
+            self._read_into(Reg.SECONDS, data, 7)
+            seconds = BCD_DECODE[data[0]]
+            minutes = BCD_DECODE[data[1]]
+            hours = BCD_DECODE[data[2]]
+            weekday = BCD_DECODE[data[3]]
+            date = BCD_DECODE[data[4]]
+            month = BCD_DECODE[data[5]]
+            year = 2000 + BCD_DECODE[data[6]]
+        yearday = DAYS_BEFORE_MONTH[(month - 1) % 12] + date
+        # 2000-2099 only, so every 4th year is a leap year
+        if month > 2 and year % 4 == 0:
+            yearday += 1
+        return time.struct_time(
+            (
+                year,
+                month,
+                date,
+                hours,
+                minutes,
+                seconds,
+                (weekday - 1) % 7,  # Sunday=0 -> struct_time Monday=0
+                yearday,
+                -1,
+            )
+        )
+
+    def set_unix_time(self, timestamp: int) -> None:
+        """
+        Sets the 32-bit Unix time counter with a single 4-byte burst write.
+        The counter increments every second and is independent of the calendar registers.
+
+        Args:
+            timestamp (int): Seconds since the epoch (0 to 2**32 - 1).
+        """
+        if timestamp < 0 or timestamp > 0xFFFFFFFF:
+            raise ValueError("Unix time must be between 0 and 2**32 - 1")
+
+        data = bytes(
+            [
+                timestamp & 0xFF,
+                (timestamp >> 8) & 0xFF,
+                (timestamp >> 16) & 0xFF,
+                (timestamp >> 24) & 0xFF,
+            ]
+        )
+        self._write_register(Reg.UNIX_TIME0, data)
+
+    def get_unix_time(self) -> int:
+        """
+        Gets the 32-bit Unix time counter with a single 4-byte burst read.
+
+        Returns:
+            int: Seconds since the epoch, as last set by set_unix_time() (or set_datetime(sync_unix=True)).
+        """
+        with self._bus:
+            data = self._rx
+            self._read_into(Reg.UNIX_TIME0, data, 4)
+            return data[0] | (data[1] << 8) | (data[2] << 16) | (data[3] << 24)
+
+    def get_datetime_into(self, buffer) -> None:
+        """
+        Gets the time and date of the device into a caller provided buffer with one burst read and
+        without allocating.
+
+        Args:
+            buffer: A writable sequence of at least 7 items (e.g. a bytearray) that receives
+                (year, month, date, hours, minutes, seconds, weekday) where year is 0-99 and
+                weekday is 0-6 with 0 representing Sunday, as in get_date().
+        """
+        with self._bus:
+            data = self._rx
+            self._read_into(Reg.SECONDS, data, 7)
+            buffer[0] = BCD_DECODE[data[6]]  # year
+            buffer[1] = BCD_DECODE[data[5]]  # month
+            buffer[2] = BCD_DECODE[data[4]]  # date
+            buffer[3] = BCD_DECODE[data[2]]  # hours
+            buffer[4] = BCD_DECODE[data[1]]  # minutes
+            buffer[5] = BCD_DECODE[data[0]]  # seconds
+            buffer[6] = BCD_DECODE[data[3]]  # weekday
 
     def set_alarm(
-        self, minute: int = None, hour: int = None, weekday: int = None
+        self,
+        minute: int = None,
+        hour: int = None,
+        weekday: int = None,
+        date: int = None,
     ) -> None:
         """
-        Set the alarm time. A value of None indicates that that portion of the alarm will not be used.
+        Set the alarm time and enable the alarm interrupt. A value of None indicates that that
+        portion of the alarm will not be used. The alarm matches either a weekday or a date of the
+        month, selected with the WADA bit, so at most one of weekday and date may be given.
+
+        The three alarm registers are written in one burst, and CONTROL1/CONTROL2 are read and
+        written back as one burst each (the read is free with the shadow cache).
 
         Args:
-            Alarm minute (0-59) or None
-            Alarm hour (0-23) or None
-            Alarm weekday (0-6, 0=Sunday) or None
+            minute (int): Alarm minute (0-59) or None
+            hour (int): Alarm hour (0-23) or None
+            weekday (int): Alarm weekday (0-6, 0=Sunday) or None
+            date (int): Alarm date of the month (1-31) or None
         """
         if minute is not None and (minute < 0 or minute > 59):
             raise ValueError("Invalid minute value")
@@ -218,20 +860,26 @@ class RV3028:
             raise ValueError("Invalid hour value")
         if weekday is not None and (weekday < 0 or weekday > 6):
             raise ValueError("Invalid weekday value")
+        if date is not None and (date < 1 or date > 31):
+            raise ValueError("Invalid date value")
+        if weekday is not None and date is not None:
+            raise ValueError("Set either a weekday or a date alarm, not both")
 
-        # Set alarm mask to check for minute, hour, and weekday match
-        control2 = self._read_register(Reg.CONTROL2)[0]
-        self._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
-        self._write_register(Reg.CONTROL2, bytes([control2]))
-
+        day = date if date is not None else weekday
         data = bytes(
-            (self._int_to_bcd(param) & Alarm.VALUE)
-            if param is not None
-            else Alarm.DISABLED
-            for param in (minute, hour, weekday)
+            BCD_ENCODE[param] if param is not None else Alarm.DISABLED
+            for param in (minute, hour, day)
         )
 
-        self._write_register(Reg.ALARM_MINUTES, data)
+        with self.batch():
+            control = self._read_register(Reg.CONTROL1, 2)
+            control1 = control[0]
+            if day is not None:
+                control1 = _with_field(control1, Control1.WADA, date is not None)
+            control2 = (control[1] & ~Control2.RESET) | Control2.ALARM_INT_ENABLE
+
+            self._write_register(Reg.ALARM_MINUTES, data)
+            self._write_register(Reg.CONTROL1, bytes([control1, control2]))
 
     def check_alarm(self, clear: bool = True) -> bool:
         """
@@ -244,84 +892,455 @@ class RV3028:
         """
         result = self._get_flag(Reg.STATUS, Status.ALARM)
         if clear and result:
-            self._set_flag(Reg.STATUS, Status.ALARM, Flag.CLEAR)
+            self._clear_flags(Status.ALARM)
+
+        return bool(result)
+
+    def start_countdown_timer(
+        self,
+        period: float,
+        freq: TimerFreq = None,
+        repeat: bool = False,
+        interrupt: bool = False,
+    ) -> float:
+        """
+        Start the periodic countdown timer. When it reaches zero the TIMER status flag is set
+        (see check_timer(), or on_interrupt(Status.TIMER, ...) with service_interrupts()).
+
+        Args:
+            period (float): The countdown period in seconds.
+            freq (TimerFreq): The countdown clock, or None (default) to pick the fastest clock that can
+                represent the period, which gives the finest resolution.
+            repeat (bool): (Default: False) True to reload and restart the countdown every period.
+            interrupt (bool): (Default: False) True to also signal the countdown on the INT pin.
+        Returns:
+            The programmed period in seconds, after rounding to whole clock ticks.
+        """
+        for clock in _TIMER_CLOCKS:
+            if freq is not None and clock != freq:
+                continue
+            tick = TIMER_TICK[clock]
+            ticks = round(period / tick)
+            if 1 <= ticks <= _TIMER_MAX_TICKS:
+                break
+        else:
+            raise ValueError(f"Period {period}s cannot be programmed into the timer")
+
+        # The countdown value is only loaded when the timer is enabled, so stop it first.
+        with self.batch():
+            self._set_flag(Reg.CONTROL1, Control1.TIMER_ENABLE, Flag.CLEAR)
+            self._set_flag(Reg.CONTROL2, Control2.TIMER_INT_ENABLE, Flag.CLEAR)
+        self._clear_flags(Status.TIMER)
+
+        with self.batch():
+            self._write_register(Reg.TIMER0, bytes([ticks & 0xFF, ticks >> 8]))
+            self._set_flag(Reg.CONTROL1, Control1.FREQ_SELECT, clock)
+            self._set_flag(Reg.CONTROL1, Control1.TIMER_REPEAT, repeat)
+            self._set_flag(Reg.CONTROL2, Control2.TIMER_INT_ENABLE, interrupt)
+            self._set_flag(Reg.CONTROL1, Control1.TIMER_ENABLE, Flag.SET)
+
+        return ticks * tick
+
+    def stop_countdown_timer(self) -> None:
+        """
+        Stop the periodic countdown timer.
+        """
+        self.timer_enabled = False
+
+    def get_timer_remaining(self) -> float:
+        """
+        Get the time left in the current countdown period.
+
+        Returns:
+            The remaining time in seconds.
+        """
+        # TIMER_STATUS0/1, STATUS and CONTROL1 are adjacent, so one burst read covers value and clock.
+        with self._bus:
+            data = self._rx
+            self._read_into(Reg.TIMER_STATUS0, data, 4)
+            ticks = data[0] | ((data[1] & 0x0F) << 8)
+            clock = data[3] & Control1.FREQ_SELECT
+            return ticks * TIMER_TICK[clock]
+
+    def check_timer(self, clear: bool = True) -> bool:
+        """
+        Check if the countdown timer flag has been triggered.
+
+        Args:
+            clear (bool): (Default: True) True to clear the timer flag, False to leave it set.
+        Returns:
+            True if timer flag is set, False otherwise
+        """
+        result = self._get_flag(Reg.STATUS, Status.TIMER)
+        if clear and result:
+            self._clear_flags(Status.TIMER)
 
         return bool(result)
 
+    def configure_update_interrupt(
+        self, per: str = "second", enable: bool = True
+    ) -> None:
+        """
+        Configure the periodic time update interrupt, which sets the UPDATE status flag on every
+        second or minute boundary (see check_update(), or on_interrupt(Status.UPDATE, ...) with
+        service_interrupts()).
+
+        Args:
+            per (str): 'second' for an update every second, 'minute' for an update every minute.
+            enable (bool): (Default: True) True to signal updates on the INT pin, False to disable.
+        """
+        if per not in ("second", "minute"):
+            raise ValueError("Invalid update period. Use 'second' or 'minute'.")
+
+        if not enable:
+            self.update_interrupt_enabled = False
+            return
+
+        self._clear_flags(Status.UPDATE)
+        with self.batch():
+            self.update_per_minute = per == "minute"
+            self.update_interrupt_enabled = True
+
+    def check_update(self, clear: bool = True) -> bool:
+        """
+        Check if the periodic time update flag has been triggered.
+
+        Args:
+            clear (bool): (Default: True) True to clear the update flag, False to leave it set.
+        Returns:
+            True if update flag is set, False otherwise
+        """
+        result = self._get_flag(Reg.STATUS, Status.UPDATE)
+        if clear and result:
+            self._clear_flags(Status.UPDATE)
+
+        return bool(result)
+
+    def on_interrupt(self, flag: Status, callback) -> None:
+        """
+        Register a handler that service_interrupts() calls when a STATUS flag is set.
+
+        Args:
+            flag (Status): One of Status.ALARM, EVENT, TIMER, UPDATE, BACKUP_SWITCH, CLOCK_OUTPUT or PORF.
+            callback: A callable taking no arguments, or None to remove the handler for the flag.
+        """
+        if flag & (flag - 1) or not flag & _INTERRUPT_FLAGS:
+            raise ValueError(f"Flag {flag:#04x} is not a single interrupt flag")
+        if callback is None:
+            self._interrupt_handlers.pop(flag, None)
+        else:
+            self._interrupt_handlers[flag] = callback
+
+    def attach_interrupt_pin(self, pin) -> None:
+        """
+        Let service_interrupts() skip the bus entirely while the INT pin reports nothing pending.
+
+        A flag that is left set keeps INT low, so a counter sees no further edges. With a
+        countio.Counter, STATUS is therefore read on every call while the last read showed flags
+        that have not been cleared since (by a handler or a check_* method), e.g. PORF after power
+        up. Clear the flags you do not handle to get the full benefit.
+
+        Args:
+            pin: A countio.Counter counting falling edges of INT, or a digitalio.DigitalInOut input
+                connected to INT (active low, so it needs a pull-up). None to detach.
+        """
+        self._int_pin = pin
+        # INT may already be held low, so read STATUS at least once
+        self._flags_left = _INTERRUPT_FLAGS
+
+    def _interrupt_pending(self) -> bool:
+        pin = self._int_pin
+        if hasattr(pin, "count"):
+            if pin.count:
+                pin.reset()
+                return True
+            # No new edge, but INT stays low while an earlier flag is still set
+            return bool(self._flags_left)
+        return not pin.value
+
+    def service_interrupts(self, force: bool = False) -> int:
+        """
+        Read STATUS once, clear every flag that has a registered handler with a single write, then
+        call those handlers. Flags without a handler are left set for the check_* methods.
+
+        Args:
+            force (bool): (Default: False) True to read STATUS even if the attached INT pin reports
+                nothing pending.
+        Returns:
+            The interrupt flags (Status bit mask) that were set, handled or not. 0 if nothing was read.
+        """
+        if self._int_pin is not None and not force and not self._interrupt_pending():
+            return 0
+
+        mask = 0
+        for flag in self._interrupt_handlers:
+            mask |= flag
+
+        status = self._take_flags(mask)
+        handled = status & mask
+        if handled:
+            for flag, callback in self._interrupt_handlers.items():
+                if handled & flag:
+                    callback()
+
+        return status & _INTERRUPT_FLAGS
+
+    def _take_flags(self, mask: int) -> int:
+        """
+        Read STATUS once and clear the flags in `mask` that are set with a single write, which
+        leaves every other flag untouched. Returns the STATUS value that was read.
+        """
+        with self._bus:
+            status = self._read_register(Reg.STATUS)[0]
+            self._flags_left = status & _INTERRUPT_FLAGS
+            if status & mask:
+                self._clear_flags(status & mask)
+        return status
+
+    def _clear_flags(self, mask: int) -> None:
+        """
+        Clear the STATUS flags in `mask` with a single write and no read. Writing 1 leaves a flag
+        unchanged, so flags that were raised meanwhile are not lost.
+        """
+        self._write_register(Reg.STATUS, bytes([~mask & _INTERRUPT_FLAGS]))
+        self._flags_left &= ~mask
+
     def get_alarm(self) -> tuple:
         """
-        If an alarm has been set on the device, provides the set time.
+        If an alarm has been set on the device, provides the set time with one burst read.
 
         Returns:
             A tuple representing the alarm configuration. A return value of None in any field means that that field was not set. Tuple values:
                 minute (int or None): the minute value of the alarm (0-59)
                 hour (int or None): the hour value of the alarm (0-23)
-                weekday (int or None): the weekday of the alarm (0-6, 0 = Sunday)
+                weekday (int or None): the weekday of the alarm (0-6, 0 = Sunday), or the date (1-31)
+                    if the alarm is in date mode (see alarm_date_mode)
+        """
+        with self._bus:
+            data = self._rx
+            self._read_into(Reg.ALARM_MINUTES, data, 3)
+            return (
+                None if data[0] & Alarm.DISABLED else BCD_DECODE[data[0] & Alarm.VALUE],
+                None if data[1] & Alarm.DISABLED else BCD_DECODE[data[1] & Alarm.VALUE],
+                None if data[2] & Alarm.DISABLED else BCD_DECODE[data[2] & Alarm.VALUE],
+            )
+
+    def apply_eeprom_config(
+        self,
+        trickle=None,
+        backup: str = None,
+        backup_interrupt: bool = None,
+        clkout: int = None,
+        offset: int = None,
+    ) -> bool:
         """
+        Apply any combination of the EEPROM backed settings with at most one EEPROM UPDATE cycle.
+        The requested settings are compared with the current configuration first, and the EEPROM is
+        not written at all if nothing changes. An argument of None leaves that setting unchanged.
 
-        # Defining the helper in here limits its scope so outside users can't access it.
-        def _get_alarm_field(reg: Reg):
-            disabled = self._get_flag(reg, Alarm.DISABLED)
-            if disabled:
-                return None
-            else:
-                return self._get_flag(reg, Alarm.VALUE)
+        Args:
+            trickle: False to disable the trickle charger, or the charge resistance in ohms
+                (3000, 5000, 9000 or 15000) to enable it.
+            backup (str): The backup switchover mode: 'level', 'direct' or 'disabled'.
+            backup_interrupt (bool): True to enable the backup switchover interrupt, False to disable.
+            clkout (int): The full EEPROM_CLKOUT register value (see EEPROMClockOut).
+            offset (int): The 9 bit two's complement EEOffset frequency correction (-256 to 255).
+        Returns:
+            True if the EEPROM was updated, False if it already held the requested configuration.
+        """
+        if self._stage_eeprom_config(trickle, backup, backup_interrupt, clkout, offset):
+            self._eecommand(EECMD.UPDATE)
+            return True
+        return False
 
-        return (
-            _get_alarm_field(Reg.ALARM_MINUTES),
-            _get_alarm_field(Reg.ALARM_HOURS),
-            _get_alarm_field(Reg.ALARM_WEEKDAY),
+    def _stage_eeprom_config(self, trickle, backup, backup_interrupt, clkout, offset):
+        """
+        Write the requested settings to the configuration RAM (EEPROM_CLKOUT through EEPROM_BACKUP)
+        and return True if an EEPROM UPDATE is needed to persist them.
+        """
+        if trickle is not None and trickle is not False:
+            if trickle not in _TRICKLE_RESISTANCE:
+                raise ValueError("Invalid trickle charger resistance")
+        if backup is not None and backup not in _BACKUP_MODES:
+            raise ValueError("Invalid mode. Use 'level', 'direct', or 'disabled'.")
+        if clkout is not None and (clkout < 0 or clkout > 0xFF):
+            raise ValueError("Clock output value must be between 0x00 and 0xFF")
+        if offset is not None and (offset < -256 or offset > 255):
+            raise ValueError("Offset value must be between -256 and 255")
+
+        with self._bus:
+            return self._write_eeprom_config(
+                trickle, backup, backup_interrupt, clkout, offset
+            )
+
+    def _write_eeprom_config(self, trickle, backup, backup_interrupt, clkout, offset):
+        current = self._read_register(Reg.EEPROM_CLKOUT, 3)
+        current = (current[0], current[1], current[2])
+        new_clkout, new_offset, new_backup = current
+
+        if trickle is False:
+            new_backup = _with_field(new_backup, EEPROMBackup.TRICKLE_CHARGE_ENABLE, 0)
+        elif trickle is not None:
+            new_backup = _with_field(new_backup, EEPROMBackup.TRICKLE_CHARGE_ENABLE, 1)
+            resistance = _TRICKLE_RESISTANCE[trickle]
+            new_backup = _with_field(
+                new_backup, EEPROMBackup.TRICKLE_CHARGE_RES, resistance
+            )
+        if backup is not None:
+            new_backup = _with_field(
+                new_backup, EEPROMBackup.BACKUP_SWITCHOVER, _BACKUP_MODES[backup]
+            )
+        if backup_interrupt is not None:
+            new_backup = _with_field(
+                new_backup,
+                EEPROMBackup.BACKUP_SWITCHOVER_INT_ENABLE,
+                1 if backup_interrupt else 0,
+            )
+        # Always enable fast edge detection
+        new_backup = _with_field(new_backup, EEPROMBackup.FEDE, 1)
+        if clkout is not None:
+            new_clkout = clkout
+        if offset is not None:
+            # Bits 8-1 live in EEPROM_OFFSET, bit 0 in EEPROM_BACKUP
+            raw = offset & 0x1FF
+            new_offset = raw >> 1
+            new_backup = _with_field(new_backup, EEPROMBackup.EEOFFSET_LSB, raw & 0x01)
+
+        if (new_clkout, new_offset, new_backup) == current:
+            return False
+
+        # Keep the automatic refresh from reloading the old values before the update
+        self._set_flag(Reg.CONTROL1, Control1.EEPROM_REFRESH_DISABLE, Flag.SET)
+        self._write_register(
+            Reg.EEPROM_CLKOUT, bytes([new_clkout, new_offset, new_backup])
         )
+        return True
 
-    def enable_trickle_charger(self, resistance=3000):
-        self._set_flag(Reg.EEPROM_BACKUP, EEPROMBackup.TRICKLE_CHARGE_ENABLE, Flag.SET)
-        self._set_flag(Reg.EEPROM_BACKUP, EEPROMBackup.TRICKLE_CHARGE_RES, Flag.CLEAR)
-
-        # Set TCR (Trickle Charge Resistor) bits
-        if resistance not in [3000, 5000, 9000, 15000]:
-            raise ValueError("Invalid trickle charger resistance")
-        if resistance == 3000:
-            tcr_value = Resistance.RES_3000
-        elif resistance == 5000:
-            tcr_value = Resistance.RES_5000
-        elif resistance == 9000:
-            tcr_value = Resistance.RES_9000
-        elif resistance == 15000:
-            tcr_value = Resistance.RES_15000
-
-        self._set_flag(Reg.EEPROM_BACKUP, EEPROMBackup.TRICKLE_CHARGE_RES, tcr_value)
-
-        # Refresh the EEPROM to apply changes
-        self._eecommand(EECMD.REFRESH)
+    def get_eeprom_offset(self) -> int:
+        """
+        Gets the EEOffset frequency correction from EEPROM_OFFSET and EEPROM_BACKUP (one burst read).
 
-    def disable_trickle_charger(self):
-        self._set_flag(
-            Reg.EEPROM_BACKUP, EEPROMBackup.TRICKLE_CHARGE_ENABLE, Flag.CLEAR
+        Returns:
+            int: The 9 bit two's complement offset (-256 to 255), in steps of about 0.9537 ppm.
+        """
+        with self._bus:
+            data = self._read_register(Reg.EEPROM_OFFSET, 2)
+            raw = (data[0] << 1) | (1 if data[1] & EEPROMBackup.EEOFFSET_LSB else 0)
+        return raw - 0x200 if raw & 0x100 else raw
+
+    def configure_clkout(
+        self,
+        freq: int = FreqSelect.FREQ_32768HZ,
+        enable: bool = True,
+        sync: bool = True,
+        interrupt_driven: bool = False,
+        interrupts: int = 0,
+    ) -> bool:
+        """
+        Configure the square wave on the CLKOUT pin. The EEPROM backed settings (frequency, CLKOE and
+        CLKSY) are persisted with at most one EEPROM UPDATE; the POR interrupt enable bit is preserved.
+
+        Args:
+            freq (int): The output frequency, a FreqSelect value.
+            enable (bool): True to drive the clock continuously, False to hold CLKOUT low.
+                Ignored when interrupt_driven is True.
+            sync (bool): True to synchronize enabling and disabling so no glitches are output.
+            interrupt_driven (bool): True to only output the clock after one of the selected interrupts
+                occurs, until the CLOCK_OUTPUT status flag is cleared.
+            interrupts (int): The interrupts that start the clock output in interrupt driven mode,
+                an OR of ClockIntOn masks (e.g. ClockIntOn.TIMER | ClockIntOn.ALARM).
+        Returns:
+            True if the EEPROM was updated, False if it already held the requested configuration.
+        """
+        if freq < FreqSelect.FREQ_32768HZ or freq > FreqSelect.LOW:
+            raise ValueError("Invalid frequency. Use a FreqSelect value.")
+        if interrupts & ~_CLOCK_INTERRUPTS:
+            raise ValueError("Invalid interrupts. Use ClockIntOn masks.")
+        if interrupt_driven and not interrupts:
+            raise ValueError(
+                "Interrupt driven clock output needs at least one interrupt"
+            )
+
+        with self._bus:
+            clkout = self._read_register(Reg.EEPROM_CLKOUT, 1)[0]
+        clkout = _with_field(clkout, EEPROMClockOut.FREQ_SELECT, freq)
+        clkout = _with_field(
+            clkout, EEPROMClockOut.CLKOUT_ENABLE, enable and not interrupt_driven
         )
-        self._eecommand(EECMD.REFRESH)
+        clkout = _with_field(clkout, EEPROMClockOut.CLKOUT_SYNC_ENABLE, sync)
+        updated = self.apply_eeprom_config(clkout=clkout)
 
-    def configure_evi(self, enable=True):
+        with self.batch():
+            if interrupt_driven:
+                self._write_register(Reg.CLOCK_INT_MASK, bytes([interrupts]))
+                self._set_flag(Reg.CONTROL2, Control2.CLOCK_OUTPUT_INT_ENABLE, Flag.SET)
+            else:
+                self._set_flag(
+                    Reg.CONTROL2, Control2.CLOCK_OUTPUT_INT_ENABLE, Flag.CLEAR
+                )
+        return updated
+
+    def enable_trickle_charger(self, resistance=3000):
+        self.apply_eeprom_config(trickle=resistance)
+
+    def disable_trickle_charger(self):
+        self.apply_eeprom_config(trickle=False)
+
+    def configure_evi(
+        self,
+        enable=True,
+        rising=True,
+        event_filter=EventFilter.FILTER_OFF,
+        overwrite=False,
+        source="evi",
+    ):
         """
-        Configure EVI for rising edge detection, enable time stamping,
-        and enable interrupt.
+        Configure EVI edge detection and glitch filtering, enable time stamping,
+        and enable interrupt. The Event Control Register is written in a single write.
 
         :param enable: True to enable EVI, False to disable
+        :param rising: True for rising edge (high level) detection, False for falling edge (low level)
+        :param event_filter: EventFilter sampling period of the digital glitch filter:
+                             FILTER_OFF, FILTER_256Hz, FILTER_64Hz or FILTER_8Hz
+        :param overwrite: False to keep the timestamp of the first event, True to overwrite it
+                          with every new event
+        :param source: 'evi' to timestamp events on the EVI pin,
+                       'backup' to timestamp switchovers to the backup supply
         """
-        if enable:
-            # Configure Event Control Register
-            self._set_flag(
-                Reg.EVENT_CONTROL, EventControl.EVENT_HIGH_LOW_SELECT, Flag.SET
-            )
-            self._set_flag(
-                Reg.EVENT_CONTROL, EventControl.EVENT_FILTER, EventFilter.FILTER_OFF
-            )
+        if not enable:
+            with self.batch():
+                self._set_flag(Reg.CONTROL2, Control2.TIMESTAMP_ENABLE, Flag.CLEAR)
+                self._set_flag(Reg.CONTROL2, Control2.EVENT_INT_ENABLE, Flag.CLEAR)
+            return
+
+        if event_filter not in (
+            EventFilter.FILTER_OFF,
+            EventFilter.FILTER_256Hz,
+            EventFilter.FILTER_64Hz,
+            EventFilter.FILTER_8Hz,
+        ):
+            raise ValueError("Invalid event filter. Use an EventFilter value.")
+        if source not in ("evi", "backup"):
+            raise ValueError("Invalid source. Use 'evi' or 'backup'.")
+
+        # Every field of the Event Control Register is set here, so no read is needed
+        event_control = _with_field(0, EventControl.EVENT_HIGH_LOW_SELECT, rising)
+        event_control = _with_field(
+            event_control, EventControl.EVENT_FILTER, event_filter
+        )
+        event_control = _with_field(
+            event_control, EventControl.TIMESTAMP_OVERWRITE, overwrite
+        )
+        event_control = _with_field(
+            event_control, EventControl.TIMESTAMP_SOURCE_SELECT, source == "backup"
+        )
+
+        with self.batch():
+            self._write_register(Reg.EVENT_CONTROL, bytes([event_control]))
 
             # Enable time stamping and EVI interrupt
             self._set_flag(Reg.CONTROL2, Control2.TIMESTAMP_ENABLE, Flag.SET)
             self._set_flag(Reg.CONTROL2, Control2.EVENT_INT_ENABLE, Flag.SET)
-        else:
-            self._set_flag(Reg.CONTROL2, Control2.TIMESTAMP_ENABLE, Flag.CLEAR)
-            self._set_flag(Reg.CONTROL2, Control2.EVENT_INT_ENABLE, Flag.CLEAR)
 
     def get_event_timestamp(self):
         """
@@ -329,16 +1348,18 @@ class RV3028:
 
         :return: Tuple of (year, month, date, hours, minutes, seconds, count)
         """
-        data = self._read_register(Reg.TIMESTAMP_COUNT, 7)
-        return (
-            self._bcd_to_int(data[6]),  # year
-            self._bcd_to_int(data[5]),  # month
-            self._bcd_to_int(data[4]),  # date
-            self._bcd_to_int(data[3]),  # hours
-            self._bcd_to_int(data[2]),  # minutes
-            self._bcd_to_int(data[1]),  # seconds
-            data[0],  # count (not BCD)
-        )
+        with self._bus:
+            data = self._rx
+            self._read_into(Reg.TIMESTAMP_COUNT, data, 7)
+            return (
+                BCD_DECODE[data[6]],  # year
+                BCD_DECODE[data[5]],  # month
+                BCD_DECODE[data[4]],  # date
+                BCD_DECODE[data[3]],  # hours
+                BCD_DECODE[data[2]],  # minutes
+                BCD_DECODE[data[1]],  # seconds
+                data[0],  # count (not BCD)
+            )
 
     def check_event_flag(self, clear=True):
         """
@@ -348,7 +1369,7 @@ class RV3028:
         """
         result = self._get_flag(Reg.STATUS, Status.EVENT)
         if result and clear:
-            self._set_flag(Reg.STATUS, Status.EVENT, Flag.CLEAR)
+            self._clear_flags(Status.EVENT)
 
         return result
 
@@ -362,32 +1383,7 @@ class RV3028:
         :param interrupt: True to enable backup switchover interrupt, False to disable
         """
 
-        if mode == "level":
-            backup_mode = BSM.LEVEL
-        elif mode == "direct":
-            backup_mode = BSM.DIRECT
-        elif mode == "disabled":
-            backup_mode = BSM.DISABLED
-        else:
-            raise ValueError("Invalid mode. Use 'level', 'direct', or 'disabled'.")
-
-        self._set_flag(Reg.EEPROM_BACKUP, EEPROMBackup.BACKUP_SWITCHOVER, backup_mode)
-
-        # Configure backup switchover interrupt
-        if interrupt:
-            self._set_flag(
-                Reg.EEPROM_BACKUP, EEPROMBackup.BACKUP_SWITCHOVER_INT_ENABLE, Flag.SET
-            )
-        else:
-            self._set_flag(
-                Reg.EEPROM_BACKUP, EEPROMBackup.BACKUP_SWITCHOVER_INT_ENABLE, Flag.CLEAR
-            )
-
-        # Always enable fast edge detection
-        self._set_flag(Reg.EEPROM_BACKUP, EEPROMBackup.FEDE, Flag.SET)
-
-        # Update EEPROM
-        self._eecommand(EECMD.REFRESH)
+        self.apply_eeprom_config(backup=mode, backup_interrupt=interrupt)
 
     def check_backup_switchover(self, clear=True):
         """
@@ -397,5 +1393,103 @@ class RV3028:
         """
         result = self._get_flag(Reg.STATUS, Status.BACKUP_SWITCH)
         if result and clear:
-            self._set_flag(Reg.STATUS, Status.BACKUP_SWITCH, Flag.CLEAR)
+            self._clear_flags(Status.BACKUP_SWITCH)
         return result
+
+    def snapshot(self, buffer: bytearray = None) -> RegisterSnapshot:
+        """
+        Read registers 0x00 (SECONDS) through 0x28 (ID) with a single burst transfer.
+
+        Args:
+            buffer (bytearray): Optional buffer of at least 41 bytes to read into, so repeated
+                snapshots do not allocate. A new bytearray is used if None.
+        Returns:
+            RegisterSnapshot: A view of the raw bytes whose fields are decoded on access.
+        """
+        if buffer is None:
+            buffer = bytearray(SNAPSHOT_SIZE)
+        elif len(buffer) < SNAPSHOT_SIZE:
+            raise ValueError("Snapshot buffer must hold at least 41 bytes")
+        self._read_into(Reg.SECONDS, buffer, SNAPSHOT_SIZE)
+        return RegisterSnapshot(buffer)
+
+    def restore(
+        self, snapshot: RegisterSnapshot, fields=DEFAULT_RESTORE_FIELDS
+    ) -> None:
+        """
+        Write selected register groups of a snapshot back to the device. Adjacent groups are merged
+        into single burst writes, and self clearing bits (RESET, TSR) are never written back.
+
+        Args:
+            snapshot (RegisterSnapshot): A snapshot taken with snapshot().
+            fields: The names of the groups to restore: 'time', 'alarm', 'timer', 'control',
+                'gp_bits', 'clock_int_mask', 'event_control', 'unix_time' and 'ram'.
+                Defaults to every configuration group, leaving time keeping untouched.
+        """
+        for name in fields:
+            if name not in FIELD_GROUPS:
+                raise ValueError("Invalid field group: " + str(name))
+
+        data = snapshot.data
+        with self.batch():
+            for name in fields:
+                start, count = FIELD_GROUPS[name]
+                self._write_register(
+                    start,
+                    bytes(
+                        data[reg] & ~_SELF_CLEARING_BITS.get(reg, 0)
+                        for reg in range(start, start + count)
+                    ),
+                )
+
+    def read_scratch(self) -> int:
+        """
+        Read the 23 bits of battery backed scratch RAM (GP_BITS, RAM1 and RAM2) with one burst read
+        from GP_BITS through RAM2. The bits survive MCU resets while the RTC stays powered.
+
+        Returns:
+            int: GP bits 6-0 in bits 6-0, RAM1 in bits 14-7 and RAM2 in bits 22-15.
+        """
+        with self._bus:
+            data = self._rx
+            self._read_into(Reg.GP_BITS, data, _SCRATCH_SPAN)
+            return (
+                (data[0] & GPBits.GPR_MASK)
+                | (data[Reg.RAM1 - Reg.GP_BITS] << 7)
+                | (data[Reg.RAM2 - Reg.GP_BITS] << 15)
+            )
+
+    def write_scratch(self, value: int, mask: int = SCRATCH_MASK) -> int:
+        """
+        Replace the scratch bits under `mask` with those of `value`. The current contents are read
+        first, and only the parts that change are written: RAM1 and RAM2 as one burst, GP_BITS with
+        its reserved bit 7 preserved.
+
+        Args:
+            value (int): The new scratch bits, laid out as returned by read_scratch().
+            mask (int): The bits to replace. Defaults to all 23 bits.
+        Returns:
+            int: The new 23 bit scratch value.
+        """
+        if mask & ~SCRATCH_MASK:
+            raise ValueError("Scratch mask must fit in 23 bits")
+
+        with self.batch():
+            data = self._rx
+            self._read_into(Reg.GP_BITS, data, _SCRATCH_SPAN)
+            gp_bits = data[0]
+            ram1 = data[Reg.RAM1 - Reg.GP_BITS]
+            ram2 = data[Reg.RAM2 - Reg.GP_BITS]
+            current = (gp_bits & GPBits.GPR_MASK) | (ram1 << 7) | (ram2 << 15)
+            new = (current & ~mask) | (value & mask)
+
+            if (new ^ current) >> 7:
+                self._write_register(Reg.RAM1, bytes([(new >> 7) & 0xFF, new >> 15]))
+            if (new ^ current) & GPBits.GPR_MASK:
+                self._write_register(
+                    Reg.GP_BITS,
+                    bytes(
+                        [_with_field(gp_bits, GPBits.GPR_MASK, new & GPBits.GPR_MASK)]
+                    ),
+                )
+        return new
@@ -0,0 +1,85 @@
+"""
+Typed scratch state kept in the battery backed RAM of the Rv3028 real time clock.
+
+GP_BITS (7 bits), RAM1 and RAM2 give 23 bits that survive MCU resets for as long as the RTC stays
+powered. Reading them is a plain register read with no EEPROM cycle, so boot code can check them on
+every start. ScratchState packs small named fields into those bits.
+"""
+
+from rv3028.rv3028 import SCRATCH_MASK
+
+_SCRATCH_BITS = 23
+
+
+class ScratchState:
+    """
+    Named fields packed into the 23 scratch bits. Fields are laid out from bit 0 upwards in the
+    order given; a field of width 1 reads as a bool.
+
+    Example Usage:
+        state = ScratchState(rtc, (("boot_phase", 3), ("watchdog_reason", 4), ("safe_mode", 1)))
+        if state.read()["safe_mode"]:
+            ...
+        state.write(boot_phase=2)
+    """
+
+    def __init__(self, rtc, layout):
+        """
+        Args:
+            rtc (RV3028): The device holding the scratch bits.
+            layout: A sequence of (name, width in bits) pairs, 23 bits in total at most.
+        """
+        self._rtc = rtc
+        self._fields = {}
+        shift = 0
+        for name, width in layout:
+            if width < 1:
+                raise ValueError("Field widths must be at least 1 bit")
+            if name in self._fields:
+                raise ValueError("Duplicate field name: " + name)
+            self._fields[name] = (shift, width)
+            shift += width
+        if shift > _SCRATCH_BITS:
+            raise ValueError("Fields need more than the 23 scratch bits")
+
+    def read(self) -> dict:
+        """
+        Read every field with a single burst read.
+
+        Returns:
+            dict: The value of each field by name.
+        """
+        packed = self._rtc.read_scratch()
+        values = {}
+        for name, (shift, width) in self._fields.items():
+            value = (packed >> shift) & ((1 << width) - 1)
+            values[name] = bool(value) if width == 1 else value
+        return values
+
+    def write(self, **values) -> None:
+        """
+        Update the given fields, leaving the others (and any unassigned bits) unchanged. Only the
+        registers whose contents change are written.
+        """
+        packed = 0
+        mask = 0
+        for name, value in values.items():
+            if name not in self._fields:
+                raise ValueError("Unknown scratch field: " + name)
+            shift, width = self._fields[name]
+            value = int(value)
+            if value < 0 or value >= 1 << width:
+                raise ValueError("Value does not fit in field " + name)
+            packed |= value << shift
+            mask |= ((1 << width) - 1) << shift
+        if mask:
+            self._rtc.write_scratch(packed, mask & SCRATCH_MASK)
+
+    def clear(self) -> None:
+        """
+        Reset every field to 0.
+        """
+        mask = 0
+        for shift, width in self._fields.values():
+            mask |= ((1 << width) - 1) << shift
+        self._rtc.write_scratch(0, mask)
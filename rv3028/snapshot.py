@@ -0,0 +1,151 @@
+"""
+Register snapshots for the Rv3028 real time clock.
+
+A snapshot holds the raw contents of registers 0x00 (SECONDS) through 0x28 (ID), read with one
+burst transfer. Fields are only decoded when they are accessed, so taking a snapshot for telemetry
+costs a single I2C transaction and no decoding.
+"""
+
+from rv3028.bcd import BCD_DECODE
+from rv3028.registers import TIMER_TICK, Alarm, Control1, Reg, Status
+
+# Registers 0x00 through ID are covered by a snapshot.
+SNAPSHOT_SIZE = Reg.ID + 1
+
+# Field groups that can be written back with RV3028.restore(), as (first register, count).
+FIELD_GROUPS = {
+    "time": (Reg.SECONDS, 7),
+    "alarm": (Reg.ALARM_MINUTES, 3),
+    "timer": (Reg.TIMER0, 2),
+    "control": (Reg.CONTROL1, 2),
+    "gp_bits": (Reg.GP_BITS, 1),
+    "clock_int_mask": (Reg.CLOCK_INT_MASK, 1),
+    "event_control": (Reg.EVENT_CONTROL, 1),
+    "unix_time": (Reg.UNIX_TIME0, 4),
+    "ram": (Reg.RAM1, 2),
+}
+
+# The configuration groups restored by default. Time keeping registers are left alone.
+DEFAULT_RESTORE_FIELDS = (
+    "alarm",
+    "timer",
+    "control",
+    "gp_bits",
+    "clock_int_mask",
+    "event_control",
+    "ram",
+)
+
+
+class RegisterSnapshot:
+    """
+    A lazily decoded view of registers 0x00 through 0x28.
+
+    Example Usage:
+        snap = rtc.snapshot()
+        beacon.append(snap.data)  # 41 raw bytes
+        if snap.field(Reg.STATUS, Status.PORF):
+            ...
+    """
+
+    def __init__(self, data: bytearray):
+        if len(data) < SNAPSHOT_SIZE:
+            raise ValueError("Snapshot data must cover registers 0x00 through 0x28")
+        self.data = data
+
+    def raw(self, register: Reg) -> int:
+        """
+        Returns:
+            int: The raw byte of `register`.
+        """
+        return self.data[register]
+
+    def field(self, register: Reg, mask: int):
+        """
+        Decode the bits under `mask` (a mask from registers.py) of `register`.
+
+        Returns:
+            bool for a single bit mask, otherwise the field value shifted down to bit 0.
+        """
+        value = (self.data[register] & mask) // (mask & -mask)
+        if mask & (mask - 1) == 0:
+            return bool(value)
+        return value
+
+    @property
+    def datetime(self) -> tuple:
+        """
+        The calendar time as (year, month, date, hours, minutes, seconds, weekday), where year is
+        0-99 and weekday 0 = Sunday, in the order of RV3028.get_datetime_into().
+        """
+        data = self.data
+        return (
+            BCD_DECODE[data[Reg.YEAR]],
+            BCD_DECODE[data[Reg.MONTH]],
+            BCD_DECODE[data[Reg.DATE]],
+            BCD_DECODE[data[Reg.HOURS]],
+            BCD_DECODE[data[Reg.MINUTES]],
+            BCD_DECODE[data[Reg.SECONDS]],
+            data[Reg.WEEKDAY],
+        )
+
+    @property
+    def unix_time(self) -> int:
+        data = self.data
+        return (
+            data[Reg.UNIX_TIME0]
+            | (data[Reg.UNIX_TIME1] << 8)
+            | (data[Reg.UNIX_TIME2] << 16)
+            | (data[Reg.UNIX_TIME3] << 24)
+        )
+
+    @property
+    def status(self) -> int:
+        return self.data[Reg.STATUS]
+
+    @property
+    def alarm(self) -> tuple:
+        """
+        The alarm as (minute, hour, weekday or date); None for fields that are not enabled.
+        """
+        data = self.data
+        return tuple(
+            None
+            if data[register] & Alarm.DISABLED
+            else BCD_DECODE[data[register] & Alarm.VALUE]
+            for register in (Reg.ALARM_MINUTES, Reg.ALARM_HOURS, Reg.ALARM_WEEKDAY)
+        )
+
+    @property
+    def timer_remaining(self) -> float:
+        """
+        The time left in the current countdown period, in seconds.
+        """
+        data = self.data
+        ticks = data[Reg.TIMER_STATUS0] | ((data[Reg.TIMER_STATUS1] & 0x0F) << 8)
+        return ticks * TIMER_TICK[data[Reg.CONTROL1] & Control1.FREQ_SELECT]
+
+    @property
+    def event_timestamp(self) -> tuple:
+        """
+        The last event time stamp as (year, month, date, hours, minutes, seconds, count), as
+        returned by RV3028.get_event_timestamp().
+        """
+        data = self.data
+        return (
+            BCD_DECODE[data[Reg.TIMESTAMP_YEAR]],
+            BCD_DECODE[data[Reg.TIMESTAMP_MONTH]],
+            BCD_DECODE[data[Reg.TIMESTAMP_DATE]],
+            BCD_DECODE[data[Reg.TIMESTAMP_HOURS]],
+            BCD_DECODE[data[Reg.TIMESTAMP_MINUTES]],
+            BCD_DECODE[data[Reg.TIMESTAMP_SECONDS]],
+            data[Reg.TIMESTAMP_COUNT],
+        )
+
+    @property
+    def eeprom_busy(self) -> bool:
+        return self.field(Reg.STATUS, Status.EEBUSY)
+
+    @property
+    def id(self) -> int:
+        return self.data[Reg.ID]
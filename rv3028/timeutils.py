@@ -0,0 +1,28 @@
+"""
+Calendar helpers shared by the Rv3028 driver modules.
+
+Plain integer arithmetic on UTC calendar fields, so conversions do not depend on the local timezone
+or on time.mktime() being available.
+"""
+
+# Cumulative day count at the start of each month for a non-leap year.
+DAYS_BEFORE_MONTH = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+
+def is_leap_year(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def epoch_seconds(year, month, date, hours, minutes, seconds) -> int:
+    """
+    Convert a UTC calendar time to seconds since 1970-01-01, independent of the local timezone.
+    """
+    leap_days = (
+        ((year - 1) // 4 - 1969 // 4)
+        - ((year - 1) // 100 - 1969 // 100)
+        + ((year - 1) // 400 - 1969 // 400)
+    )
+    days = (year - 1970) * 365 + leap_days + DAYS_BEFORE_MONTH[month - 1] + date - 1
+    if month > 2 and is_leap_year(year):
+        days += 1
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
@@ -0,0 +1,214 @@
+"""
+A small persistent store in the 43 bytes of user EEPROM of the Rv3028 real time clock.
+
+Every EEPROM byte read or written costs a command cycle of several milliseconds, and every write
+wears the cell. UserEEPROM keeps a RAM copy of the bytes it has seen so repeated reads are free, and
+only writes bytes that actually change. On top of it, records carry a CRC8 so torn or erased data is
+detected, and WearLevelledCounter spreads frequent updates (e.g. boot counters) over several slots.
+"""
+
+from rv3028.eeprom import USER_EEPROM_SIZE
+
+# CRC-8 with polynomial x^8 + x^2 + x + 1. A nonzero initial value keeps erased (all zero) records
+# from passing the check.
+_CRC8_POLY = 0x07
+_CRC8_INIT = 0xFF
+
+
+def crc8(data, start: int = 0, end: int = None) -> int:
+    """
+    Returns:
+        int: The CRC8 of data[start:end].
+    """
+    if end is None:
+        end = len(data)
+    crc = _CRC8_INIT
+    for i in range(start, end):
+        crc ^= data[i]
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ _CRC8_POLY) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+    return crc
+
+
+class UserEEPROM:
+    """
+    Cached byte, block and record access to the user EEPROM.
+
+    Example Usage:
+        store = UserEEPROM(rtc)
+        store.write_record(0, bytes([reset_reason]))
+        boots = store.counter(8, slots=4)
+        boots.increment()
+    """
+
+    def __init__(self, rtc):
+        self._rtc = rtc
+        self._cache = bytearray(USER_EEPROM_SIZE)
+        self._cached = bytearray(
+            USER_EEPROM_SIZE
+        )  # 1 where _cache holds the EEPROM byte
+
+    def invalidate(self) -> None:
+        """
+        Forget the cached contents, e.g. after the EEPROM was written by other code.
+        """
+        for i in range(USER_EEPROM_SIZE):
+            self._cached[i] = 0
+
+    def read_into(self, address: int, buffer, length: int = None) -> None:
+        """
+        Read consecutive bytes into the start of `buffer`. Only bytes not yet cached are read from
+        the EEPROM.
+        """
+        if length is None:
+            length = len(buffer)
+        self._rtc._check_user_eeprom_range(address, length)
+        cache = self._cache
+        for offset in range(length):
+            i = address + offset
+            if not self._cached[i]:
+                cache[i] = self._rtc.read_user_eeprom(i)
+                self._cached[i] = 1
+            buffer[offset] = cache[i]
+
+    def read(self, address: int, length: int = 1) -> bytes:
+        """
+        Returns:
+            bytes: `length` bytes starting at `address`.
+        """
+        buffer = bytearray(length)
+        self.read_into(address, buffer)
+        return bytes(buffer)
+
+    def write(self, address: int, data) -> int:
+        """
+        Store `data` starting at `address`, skipping bytes that already hold the right value.
+
+        Returns:
+            int: The number of bytes actually written to the EEPROM.
+        """
+        self._rtc._check_user_eeprom_range(address, len(data))
+        written = 0
+        current = bytearray(1)
+        for offset, value in enumerate(data):
+            i = address + offset
+            self.read_into(i, current)
+            if current[0] == value:
+                continue
+            self._rtc.write_user_eeprom(i, value)
+            self._cache[i] = value
+            written += 1
+        return written
+
+    def read_record(self, address: int, length: int) -> bytes:
+        """
+        Read a record of `length` payload bytes followed by its CRC8.
+
+        Returns:
+            bytes: The payload, or None if the CRC does not match (erased or torn record).
+        """
+        buffer = bytearray(length + 1)
+        self.read_into(address, buffer)
+        if crc8(buffer, 0, length) != buffer[length]:
+            return None
+        return bytes(buffer[:length])
+
+    def write_record(self, address: int, payload) -> int:
+        """
+        Write `payload` followed by its CRC8, using len(payload) + 1 bytes of EEPROM.
+
+        Returns:
+            int: The number of bytes actually written to the EEPROM.
+        """
+        return self.write(address, bytes(payload) + bytes([crc8(payload)]))
+
+    def counter(self, address: int, slots: int = 4, width: int = 2):
+        """
+        Returns:
+            WearLevelledCounter: A counter stored at `address` (see WearLevelledCounter).
+        """
+        return WearLevelledCounter(self, address, slots, width)
+
+
+class WearLevelledCounter:
+    """
+    A counter written round-robin over `slots` records, so each EEPROM cell only sees 1/slots of the
+    updates. Each slot holds a sequence byte, the value (`width` bytes, little-endian) and a CRC8; the
+    valid slot with the newest sequence number holds the current value. An interrupted write only
+    loses the update in progress.
+    """
+
+    def __init__(self, store: UserEEPROM, address: int, slots: int = 4, width: int = 2):
+        if slots < 1 or slots > 127:
+            raise ValueError("Slots must be between 1 and 127")
+        if width < 1 or width > 4:
+            raise ValueError("Width must be between 1 and 4 bytes")
+        self._store = store
+        self.address = address
+        self.slots = slots
+        self.width = width
+        self.slot_size = width + 2
+        self.size = slots * self.slot_size
+        store._rtc._check_user_eeprom_range(address, self.size)
+        self._slot = None  # Slot of the current value
+        self._sequence = 0
+        self._value = 0
+
+    def _load(self):
+        best = None
+        for slot in range(self.slots):
+            record = self._store.read_record(
+                self.address + slot * self.slot_size, self.width + 1
+            )
+            if record is None:
+                continue
+            sequence = record[0]
+            # Sequence numbers wrap, so compare them as serial numbers
+            if best is None or 0 < ((sequence - self._sequence) & 0xFF) < 128:
+                best = slot
+                self._sequence = sequence
+                self._value = int.from_bytes(record[1:], "little")
+        if best is None:
+            # Nothing written yet: the first write goes to slot 0
+            best = self.slots - 1
+            self._sequence = 0xFF
+            self._value = 0
+        self._slot = best
+
+    @property
+    def value(self) -> int:
+        if self._slot is None:
+            self._load()
+        return self._value
+
+    def set(self, value: int) -> None:
+        """
+        Store `value` in the next slot.
+        """
+        if value < 0 or value >= 1 << (8 * self.width):
+            raise ValueError("Value does not fit in the counter width")
+        if self._slot is None:
+            self._load()
+        slot = (self._slot + 1) % self.slots
+        sequence = (self._sequence + 1) & 0xFF
+        self._store.write_record(
+            self.address + slot * self.slot_size,
+            bytes([sequence]) + value.to_bytes(self.width, "little"),
+        )
+        self._slot = slot
+        self._sequence = sequence
+        self._value = value
+
+    def increment(self, amount: int = 1) -> int:
+        """
+        Add `amount` to the counter, wrapping at the counter width.
+
+        Returns:
+            int: The new value.
+        """
+        value = (self.value + amount) % (1 << (8 * self.width))
+        self.set(value)
+        return value
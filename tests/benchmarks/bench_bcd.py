@@ -0,0 +1,133 @@
+"""
+Micro-benchmark of the table driven BCD codec and the getters built on it against the previous
+per-field instance methods.
+
+Run from the repository root with: python -m tests.benchmarks.bench_bcd
+"""
+
+import timeit
+
+from rv3028.bcd import BCD_DECODE, BCD_ENCODE, decode_bcd_into, int_to_bcd
+from rv3028.registers import Reg
+from rv3028.rv3028 import RV3028
+from tests.mocks.i2cMock import MockI2C, MockI2CDevice
+
+TIMESTAMP = bytearray([0x03, 0x10, 0x20, 0x12, 0x25, 0x09, 0x21])
+NUMBER = 100_000
+
+
+class MethodCodec:
+    """The codec as it was implemented on RV3028 before the lookup tables."""
+
+    def _bcd_to_int(self, bcd):
+        return (bcd & 0x0F) + ((bcd >> 4) * 10)
+
+    def _int_to_bcd(self, value):
+        return ((value // 10) << 4) | (value % 10)
+
+
+def decode_methods(codec=MethodCodec(), data=TIMESTAMP):
+    return (
+        codec._bcd_to_int(data[6]),
+        codec._bcd_to_int(data[5]),
+        codec._bcd_to_int(data[4]),
+        codec._bcd_to_int(data[3]),
+        codec._bcd_to_int(data[2]),
+        codec._bcd_to_int(data[1]),
+        data[0],
+    )
+
+
+def decode_table(data=TIMESTAMP, scratch=bytearray(7)):
+    decode_bcd_into(data, scratch, 1, 7)
+    return (
+        scratch[6],
+        scratch[5],
+        scratch[4],
+        scratch[3],
+        scratch[2],
+        scratch[1],
+        data[0],
+    )
+
+
+def decode_subscripts(data=TIMESTAMP, table=BCD_DECODE):
+    return (
+        table[data[6]],
+        table[data[5]],
+        table[data[4]],
+        table[data[3]],
+        table[data[2]],
+        table[data[1]],
+        data[0],
+    )
+
+
+class MethodRV3028(RV3028):
+    """The getters as they were implemented before the lookup tables."""
+
+    def get_time(self):
+        data = self._read_register(Reg.SECONDS, 3)
+        return (
+            MethodCodec._bcd_to_int(self, data[2]),
+            MethodCodec._bcd_to_int(self, data[1]),
+            MethodCodec._bcd_to_int(self, data[0]),
+        )
+
+    def get_event_timestamp(self):
+        data = self._read_register(Reg.TIMESTAMP_COUNT, 7)
+        return (
+            MethodCodec._bcd_to_int(self, data[6]),
+            MethodCodec._bcd_to_int(self, data[5]),
+            MethodCodec._bcd_to_int(self, data[4]),
+            MethodCodec._bcd_to_int(self, data[3]),
+            MethodCodec._bcd_to_int(self, data[2]),
+            MethodCodec._bcd_to_int(self, data[1]),
+            data[0],
+        )
+
+
+def encode_methods(codec=MethodCodec()):
+    return bytes(codec._int_to_bcd(value) for value in (58, 59, 23))
+
+
+def encode_table():
+    return bytes(int_to_bcd(value) for value in (58, 59, 23))
+
+
+def encode_subscripts(table=BCD_ENCODE):
+    return bytes([table[58], table[59], table[23]])
+
+
+def _rtc(cls):
+    rtc = cls(MockI2CDevice(MockI2C(), 0x52))
+    rtc.i2c_device.i2c.registers[Reg.SECONDS : Reg.SECONDS + 3] = [0x58, 0x59, 0x23]
+    return rtc
+
+
+def main():
+    assert decode_methods() == decode_table()
+    assert decode_methods() == decode_subscripts()
+    assert encode_methods() == encode_table() == encode_subscripts()
+    method_rtc = _rtc(MethodRV3028)
+    table_rtc = _rtc(RV3028)
+    assert method_rtc.get_time() == table_rtc.get_time()
+    assert method_rtc.get_event_timestamp() == table_rtc.get_event_timestamp()
+    for name, func in (
+        ("decode timestamp (methods)", decode_methods),
+        ("decode timestamp (bulk)", decode_table),
+        ("decode timestamp (subscripts)", decode_subscripts),
+        ("encode time (methods)", encode_methods),
+        ("encode time (int_to_bcd)", encode_table),
+        ("encode time (subscripts)", encode_subscripts),
+        ("get_time (methods)", method_rtc.get_time),
+        ("get_time (tables)", table_rtc.get_time),
+        ("get_event_timestamp (methods)", method_rtc.get_event_timestamp),
+        ("get_event_timestamp (tables)", table_rtc.get_event_timestamp),
+    ):
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{name:30s} {seconds / NUMBER * 1e9:8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of register flag access with the precomputed mask shift table against the previous
+bit by bit shift search.
+
+Run from the repository root with: python -m tests.benchmarks.bench_flags
+"""
+
+import timeit
+
+from rv3028.bitfields import MASK_SHIFT
+from rv3028.registers import Control1, EventControl, Reg
+from rv3028.rv3028 import RV3028
+from tests.mocks.i2cMock import MockI2C, MockI2CDevice
+
+NUMBER = 100_000
+MASKS = (Control1.TIMER_REPEAT, EventControl.EVENT_FILTER, Control1.FREQ_SELECT)
+
+
+class LoopRV3028(RV3028):
+    """The flag helpers as they were implemented before the mask shift table."""
+
+    def _set_flag(self, register, mask, value):
+        try:
+            value = int(value)
+        except Exception:
+            raise ValueError("Argument 'value' must be an integer or boolean")
+
+        shift = 0
+        temp_mask = mask
+        while (temp_mask & 0x01) == 0:
+            temp_mask >>= 1
+            shift += 1
+
+        max_value = mask >> shift
+        if value < 0 or value > max_value:
+            raise ValueError(f"Value {value} does not fit in the mask {mask:#04x}")
+
+        with self._bus:
+            data = self._read_register(register)[0]
+            data &= ~mask
+            data |= (value << shift) & mask
+            self._write_register(register, bytes([data]))
+
+
+def shift_loop(masks=MASKS):
+    for mask in masks:
+        shift = 0
+        temp_mask = mask
+        while (temp_mask & 0x01) == 0:
+            temp_mask >>= 1
+            shift += 1
+
+
+def shift_table(masks=MASKS, table=MASK_SHIFT):
+    for mask in masks:
+        table[mask]
+
+
+def _rtc(cls):
+    return cls(MockI2CDevice(MockI2C(), 0x52), cache=True)
+
+
+def main():
+    loop_rtc = _rtc(LoopRV3028)
+    table_rtc = _rtc(RV3028)
+    for name, func in (
+        ("mask shift x3 (loop)", shift_loop),
+        ("mask shift x3 (table)", shift_table),
+        (
+            "_set_flag 128 (loop)",
+            lambda: loop_rtc._set_flag(Reg.CONTROL1, Control1.TIMER_REPEAT, 1),
+        ),
+        (
+            "_set_flag 128 (table)",
+            lambda: table_rtc._set_flag(Reg.CONTROL1, Control1.TIMER_REPEAT, 1),
+        ),
+        (
+            "_get_flag 0x30 (table)",
+            lambda: table_rtc._get_flag(Reg.EVENT_CONTROL, EventControl.EVENT_FILTER),
+        ),
+    ):
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{name:30s} {seconds / NUMBER * 1e9:8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import pytest
+from mocks.i2cMock import MockI2C, MockI2CDevice
+
+from rv3028.async_rv3028 import AsyncRV3028
+from rv3028.rv3028 import RV3028
+
+
+@pytest.fixture
+def rtc():
+    i2c_bus = MockI2C()
+    i2c_device = MockI2CDevice(i2c_bus, 0x52)
+    rtc = RV3028(i2c_device)
+    return rtc
+
+
+@pytest.fixture
+def cached_rtc():
+    i2c_bus = MockI2C()
+    i2c_device = MockI2CDevice(i2c_bus, 0x52)
+    rtc = RV3028(i2c_device, cache=True)
+    return rtc
+
+
+@pytest.fixture
+def async_rtc():
+    i2c_bus = MockI2C()
+    i2c_device = MockI2CDevice(i2c_bus, 0x52)
+    rtc = AsyncRV3028(i2c_device)
+    return rtc
@@ -1,9 +1,35 @@
 from tests.stubs.i2c_device import I2C, I2CDevice
 
+STATUS = 0x0E
+EEBUSY = 0x80
+UNIX_TIME0 = 0x1B
+EEADDR = 0x25
+EEDATA = 0x26
+EECMD = 0x27
+EEPROM_CLKOUT = 0x35
+EEPROM_OFFSET = 0x36
+EEPROM_BACKUP = 0x37
+
 
 class MockI2C(I2C):
     def __init__(self):
         self.registers = [0x00] * 256  # 256 8 bit registers
+        # EEPROM model: 43 bytes of user EEPROM and the configuration EEPROM behind 0x35-0x37
+        self.user_eeprom = [0x00] * 43
+        self.config_eeprom = [0x00] * 3
+        self.eeprom_writes = 0  # Number of user EEPROM bytes programmed
+
+    def eecommand(self, command):
+        registers = self.registers
+        if command == 0x11:  # UPDATE
+            self.config_eeprom = registers[EEPROM_CLKOUT : EEPROM_BACKUP + 1]
+        elif command == 0x12:  # REFRESH
+            registers[EEPROM_CLKOUT : EEPROM_BACKUP + 1] = self.config_eeprom
+        elif command == 0x21:  # WRITE_ONE_BYTE
+            self.user_eeprom[registers[EEADDR]] = registers[EEDATA]
+            self.eeprom_writes += 1
+        elif command == 0x22:  # READ_ONE_BYTE
+            registers[EEDATA] = self.user_eeprom[registers[EEADDR]]
 
 
 class MockI2CDevice(I2CDevice):
@@ -11,6 +37,7 @@ class MockI2CDevice(I2CDevice):
         self.i2c = i2c
         self.address = address
         self.current_register = None
+        self.transactions = 0  # Number of bus transactions (START ... STOP) issued
 
     # Context manager methods
     def __enter__(self):
@@ -19,20 +46,87 @@ class MockI2CDevice(I2CDevice):
     def __exit__(self, exc_type, exc_value, traceback):
         pass
 
-    def write(self, data):
+    def write(self, data, *, start=0, end=None):
+        self.transactions += 1
+        self._write(data[start:end])
+
+    def readinto(self, buffer, *, start=0, end=None):
+        self.transactions += 1
+        self._readinto(buffer, start, end)
+
+    def write_then_readinto(
+        self,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start=0,
+        out_end=None,
+        in_start=0,
+        in_end=None,
+    ):
+        # A repeated start keeps the write and the read in a single transaction
+        self.transactions += 1
+        self._write(out_buffer[out_start:out_end])
+        self._readinto(in_buffer, in_start, in_end)
+
+    def _write(self, data):
         if len(data) == 1:
             # Setting current register for subsequent read
             self.current_register = data[0]
         elif len(data) > 1:
             # First byte is the register address
             register = data[0]
+            old_status = self.i2c.registers[STATUS]
             # Write the data to consecutive registers
             self.i2c.registers[register : register + len(data[1:])] = data[1:]
+            if register <= STATUS < register + len(data) - 1:
+                # Status flags are only cleared by writing 0, and EEBUSY is read only
+                written = self.i2c.registers[STATUS]
+                self.i2c.registers[STATUS] = (old_status & written & ~EEBUSY) | (
+                    old_status & EEBUSY
+                )
             self.current_register = register  # Update current register
+            if register <= EECMD < register + len(data) - 1:
+                self.i2c.eecommand(self.i2c.registers[EECMD])
 
-    def readinto(self, buffer):
+    def _readinto(self, buffer, start, end):
         if self.current_register is None:
             raise RuntimeError("Register address not set before read")
-        for i in range(len(buffer)):
-            buffer[i] = self.i2c.registers[self.current_register + i]
-        self.current_register += len(buffer)
+        if end is None:
+            end = len(buffer)
+        for i in range(start, end):
+            buffer[i] = self.i2c.registers[self.current_register + i - start]
+        self.current_register += end - start
+
+
+class MockDriftingClock:
+    """
+    Simulates the RTC's Unix time counter running at an error of `ppm` against a reference clock,
+    reduced by the EEOffset correction currently programmed into the mock registers
+    (about 0.9537 ppm per step).
+    """
+
+    def __init__(self, i2c: MockI2C, ppm, start=1700000000):
+        self.i2c = i2c
+        self.ppm = ppm
+        self.reference = start
+        self.rtc_time = float(start)
+        self._write_counter()
+
+    def offset(self):
+        raw = (self.i2c.registers[EEPROM_OFFSET] << 1) | (
+            self.i2c.registers[EEPROM_BACKUP] >> 7
+        )
+        return raw - 0x200 if raw & 0x100 else raw
+
+    def advance(self, seconds):
+        effective_ppm = self.ppm - self.offset() * 0.9537
+        self.reference += seconds
+        self.rtc_time += seconds * (1 + effective_ppm / 1e6)
+        self._write_counter()
+
+    def _write_counter(self):
+        counter = int(self.rtc_time)
+        self.i2c.registers[UNIX_TIME0 : UNIX_TIME0 + 4] = [
+            (counter >> shift) & 0xFF for shift in (0, 8, 16, 24)
+        ]
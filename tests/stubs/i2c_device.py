@@ -2,8 +2,18 @@ class I2CDevice:
     def __init__(self, i2c, address): ...
     def __enter__(self): ...
     def __exit__(self, exc_type, exc_value, traceback): ...
-    def write(self, data): ...
-    def readinto(self, buffer): ...
+    def write(self, data, *, start=0, end=None): ...
+    def readinto(self, buffer, *, start=0, end=None): ...
+    def write_then_readinto(
+        self,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start=0,
+        out_end=None,
+        in_start=0,
+        in_end=None,
+    ): ...
 
 
 class I2C:
@@ -1,28 +1,34 @@
+import calendar
+import os
+import threading
+import time
+import tracemalloc
+
 import pytest
 from mocks.i2cMock import MockI2C, MockI2CDevice
 
+import rv3028.rv3028 as rv3028_module
 from rv3028.registers import (
     BSM,
+    EECMD,
     Alarm,
+    ClockIntOn,
+    Control1,
     Control2,
     EEPROMBackup,
+    EEPROMClockOut,
     EventControl,
+    EventFilter,
     Flag,
+    FreqSelect,
     Reg,
     Resistance,
     Status,
+    TimerFreq,
 )
 from rv3028.rv3028 import RV3028
 
 
-@pytest.fixture
-def rtc():
-    i2c_bus = MockI2C()
-    i2c_device = MockI2CDevice(i2c_bus, 0x52)
-    rtc = RV3028(i2c_device)
-    return rtc
-
-
 # Test functions
 def test_set_and_get_time(rtc):
     rtc.set_time(23, 59, 58)
@@ -32,6 +38,42 @@ def test_set_and_get_time(rtc):
     assert seconds == 58
 
 
+def test_get_time_into(rtc):
+    rtc.set_time(12, 34, 56)
+    buffer = bytearray(3)
+    rtc.get_time_into(buffer)
+    assert tuple(buffer) == (12, 34, 56)
+
+
+def test_get_into_methods_keep_no_allocations(rtc):
+    # tracemalloc only sees blocks that are still alive, so this counts what the driver
+    # allocates and keeps across calls, not short lived temporaries
+    buffer = bytearray(7)
+
+    def read_all():
+        for _ in range(100):
+            rtc.get_time_into(buffer)
+            rtc.get_date_into(buffer)
+            rtc.get_datetime_into(buffer)
+
+    read_all()  # Warm up any lazily created state
+    package = tracemalloc.Filter(True, os.path.join("*", "rv3028", "*"))
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces((package,))
+        read_all()
+        after = tracemalloc.take_snapshot().filter_traces((package,))
+    finally:
+        tracemalloc.stop()
+
+    grown = [
+        stat
+        for stat in after.compare_to(before, "lineno")
+        if stat.count_diff or stat.size_diff
+    ]
+    assert grown == []
+
+
 def test_set_and_get_date(rtc):
     rtc.set_date(21, 12, 31, 5)  # Year, month, date, weekday
     year, month, date, weekday = rtc.get_date()
@@ -41,12 +83,72 @@ def test_set_and_get_date(rtc):
     assert weekday == 5
 
 
+def test_set_and_get_datetime(rtc):
+    rtc.set_datetime((2024, 3, 1, 23, 59, 58, 4, 0, -1))  # Friday
+    dt = rtc.get_datetime()
+    assert tuple(dt) == (2024, 3, 1, 23, 59, 58, 4, 61, -1)
+    assert rtc.get_time() == (23, 59, 58)
+    assert rtc.get_date() == (24, 3, 1, 5)  # Device weekday uses Sunday=0
+
+
+def test_get_datetime_into(rtc):
+    rtc.set_datetime((2024, 3, 1, 23, 59, 58, 4, 0, -1))
+    buffer = bytearray(7)
+    rtc.get_datetime_into(buffer)
+    assert tuple(buffer) == (24, 3, 1, 23, 59, 58, 5)
+
+
+def test_get_datetime_is_one_transaction(rtc):
+    rtc.get_datetime()
+    assert rtc.i2c_device.transactions == 1
+
+
+def test_set_and_get_unix_time(rtc):
+    rtc.set_unix_time(0xDEADBEEF)
+    assert rtc.i2c_device.i2c.registers[Reg.UNIX_TIME0 : Reg.UNIX_TIME3 + 1] == [
+        0xEF,
+        0xBE,
+        0xAD,
+        0xDE,
+    ]
+    assert rtc.get_unix_time() == 0xDEADBEEF
+
+    with pytest.raises(ValueError):
+        rtc.set_unix_time(-1)
+    with pytest.raises(ValueError):
+        rtc.set_unix_time(2**32)
+
+
+def test_set_datetime_syncs_unix_time(rtc):
+    rtc.set_datetime((2024, 3, 1, 23, 59, 58, 4, 0, -1), sync_unix=True)
+    assert rtc.get_unix_time() == calendar.timegm((2024, 3, 1, 23, 59, 58))
+
+    rtc.set_datetime((2099, 12, 31, 0, 0, 0, 3, 0, -1), sync_unix=True)
+    assert rtc.get_unix_time() == calendar.timegm((2099, 12, 31, 0, 0, 0))
+
+
+def test_set_datetime_invalid(rtc):
+    with pytest.raises(ValueError):
+        rtc.set_datetime((1999, 3, 1, 23, 59, 58, 4))
+    with pytest.raises(ValueError):
+        rtc.set_datetime((2024, 13, 1, 23, 59, 58, 4))
+
+
 def test_set_flag(rtc):
     # Check if _set_flag raises a ValueError
     with pytest.raises(ValueError):
         rtc._set_flag(0, 0, "funny string")
 
 
+def test_set_flag_transactions(rtc, cached_rtc):
+    rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
+    assert rtc.i2c_device.transactions == 2  # Read, then write
+
+    cached_rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
+    cached_rtc._set_flag(Reg.CONTROL2, Control2.TIMER_INT_ENABLE, Flag.SET)
+    assert cached_rtc.i2c_device.transactions == 3  # One read, two writes
+
+
 def test_set_alarm(rtc):
     rtc.set_alarm(minute=30, hour=14, weekday=3)
     alarm_minutes = rtc._read_register(Reg.ALARM_MINUTES)[0]
@@ -58,7 +160,7 @@ def test_set_alarm(rtc):
 
 
 def test_check_alarm(rtc):
-    rtc._set_flag(Reg.STATUS, Status.ALARM, Flag.SET)
+    rtc.i2c_device.i2c.registers[Reg.STATUS] |= Status.ALARM
     assert rtc.check_alarm()
     status = rtc._read_register(Reg.STATUS)[0]
     assert not (status & Status.ALARM)
@@ -81,6 +183,46 @@ def test_get_alarm(rtc):
     assert rtc.get_alarm() == (4, 5, 6)
 
 
+def test_get_alarm_decodes_bcd(rtc):
+    rtc.set_alarm(minute=45, hour=23, weekday=None)
+    assert rtc.get_alarm() == (45, 23, None)
+
+
+def test_set_alarm_date_mode(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.CONTROL1] = Control1.TIMER_REPEAT
+    registers[Reg.CONTROL2] = Control2.TIMER_INT_ENABLE
+    rtc.set_alarm(minute=0, hour=12, date=31)
+    assert registers[Reg.ALARM_DATE] == 0x31
+    assert registers[Reg.CONTROL1] == Control1.TIMER_REPEAT | Control1.WADA
+    assert registers[Reg.CONTROL2] == (
+        Control2.TIMER_INT_ENABLE | Control2.ALARM_INT_ENABLE
+    )
+    assert rtc.alarm_date_mode
+    assert rtc.get_alarm() == (0, 12, 31)
+
+    rtc.set_alarm(minute=0, hour=12, weekday=2)
+    assert not rtc.alarm_date_mode
+
+    with pytest.raises(ValueError):
+        rtc.set_alarm(weekday=1, date=1)
+    with pytest.raises(ValueError):
+        rtc.set_alarm(date=0)
+
+
+def test_alarm_transactions(rtc, cached_rtc):
+    rtc.set_alarm(minute=30, hour=14, weekday=3)
+    assert rtc.i2c_device.transactions == 3  # Control burst read, two burst writes
+    rtc.i2c_device.transactions = 0
+    rtc.get_alarm()
+    assert rtc.i2c_device.transactions == 1
+
+    cached_rtc._read_register(Reg.CONTROL1, 2)
+    cached_rtc.i2c_device.transactions = 0
+    cached_rtc.set_alarm(minute=30, hour=14, weekday=3)
+    assert cached_rtc.i2c_device.transactions == 2
+
+
 def test_enable_trickle_charger(rtc):
     rtc.enable_trickle_charger(resistance=9000)
     backup_reg = rtc._read_register(Reg.EEPROM_BACKUP)[0]
@@ -95,6 +237,44 @@ def test_disable_trickle_charger(rtc):
     assert not (backup_reg & EEPROMBackup.TRICKLE_CHARGE_ENABLE)
 
 
+def test_configure_clkout(rtc):
+    rtc.i2c_device.i2c.registers[Reg.EEPROM_CLKOUT] = EEPROMClockOut.POR_INT_ENABLE
+    assert rtc.configure_clkout(freq=FreqSelect.FREQ_1024HZ, sync=False)
+    clkout = rtc._read_register(Reg.EEPROM_CLKOUT)[0]
+    assert clkout & EEPROMClockOut.FREQ_SELECT == FreqSelect.FREQ_1024HZ
+    assert clkout & EEPROMClockOut.CLKOUT_ENABLE
+    assert not clkout & EEPROMClockOut.CLKOUT_SYNC_ENABLE
+    assert clkout & EEPROMClockOut.POR_INT_ENABLE
+    assert rtc.i2c_device.i2c.registers[Reg.EECMD] == EECMD.UPDATE
+    assert not rtc._read_register(Reg.CONTROL2)[0] & Control2.CLOCK_OUTPUT_INT_ENABLE
+
+    # Same configuration again needs no EEPROM update
+    assert not rtc.configure_clkout(freq=FreqSelect.FREQ_1024HZ, sync=False)
+
+
+def test_configure_clkout_interrupt_driven(rtc):
+    rtc.configure_clkout(
+        freq=FreqSelect.FREQ_1HZ,
+        interrupt_driven=True,
+        interrupts=ClockIntOn.TIMER | ClockIntOn.ALARM,
+    )
+    clkout = rtc._read_register(Reg.EEPROM_CLKOUT)[0]
+    assert not clkout & EEPROMClockOut.CLKOUT_ENABLE
+    assert clkout & EEPROMClockOut.FREQ_SELECT == FreqSelect.FREQ_1HZ
+    mask = rtc._read_register(Reg.CLOCK_INT_MASK)[0]
+    assert mask == ClockIntOn.TIMER | ClockIntOn.ALARM
+    assert rtc._read_register(Reg.CONTROL2)[0] & Control2.CLOCK_OUTPUT_INT_ENABLE
+
+
+def test_configure_clkout_invalid(rtc):
+    with pytest.raises(ValueError):
+        rtc.configure_clkout(freq=8)
+    with pytest.raises(ValueError):
+        rtc.configure_clkout(interrupts=0x10)
+    with pytest.raises(ValueError):
+        rtc.configure_clkout(interrupt_driven=True)
+
+
 def test_configure_evi(rtc):
     rtc.configure_evi(enable=True)
     control2 = rtc._read_register(Reg.CONTROL2)[0]
@@ -104,6 +284,47 @@ def test_configure_evi(rtc):
     assert event_control & EventControl.EVENT_HIGH_LOW_SELECT
 
 
+def test_configure_evi_filter_and_edge(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.EVENT_CONTROL] = 0xFF
+    rtc.configure_evi(
+        rising=False,
+        event_filter=EventFilter.FILTER_64Hz,
+        overwrite=True,
+        source="backup",
+    )
+    event_control = registers[Reg.EVENT_CONTROL]
+    assert not event_control & EventControl.EVENT_HIGH_LOW_SELECT
+    assert event_control & EventControl.EVENT_FILTER == EventFilter.FILTER_64Hz << 4
+    assert event_control & EventControl.TIMESTAMP_OVERWRITE
+    assert event_control & EventControl.TIMESTAMP_SOURCE_SELECT
+    assert not event_control & EventControl.TIMESTAMP_RESET
+    assert registers[Reg.CONTROL2] & Control2.TIMESTAMP_ENABLE
+    assert registers[Reg.CONTROL2] & Control2.EVENT_INT_ENABLE
+
+
+def test_configure_evi_single_event_control_write(rtc, monkeypatch):
+    writes = _count_writes(rtc, monkeypatch)
+    rtc.configure_evi(event_filter=EventFilter.FILTER_8Hz)
+    assert [w[0] for w in writes] == [Reg.CONTROL2, Reg.EVENT_CONTROL]
+    assert rtc.i2c_device.transactions == 3  # CONTROL2 read, two writes
+
+
+def test_configure_evi_disable(rtc):
+    rtc.configure_evi()
+    rtc.configure_evi(enable=False)
+    control2 = rtc._read_register(Reg.CONTROL2)[0]
+    assert not control2 & Control2.TIMESTAMP_ENABLE
+    assert not control2 & Control2.EVENT_INT_ENABLE
+
+
+def test_configure_evi_invalid(rtc):
+    with pytest.raises(ValueError):
+        rtc.configure_evi(event_filter=4)
+    with pytest.raises(ValueError):
+        rtc.configure_evi(source="radio")
+
+
 def test_get_event_timestamp(rtc):
     timestamp = [
         rtc._int_to_bcd(0),  # count
@@ -121,7 +342,7 @@ def test_get_event_timestamp(rtc):
 
 def test_check_event_flag_set_and_clear(rtc):
     # Set the event flag
-    rtc._set_flag(Reg.STATUS, Status.EVENT, Flag.SET)
+    rtc.i2c_device.i2c.registers[Reg.STATUS] |= Status.EVENT
     assert rtc.check_event_flag()  # Check and clear the flag
     status = rtc._read_register(Reg.STATUS)[0]
     assert not (status & Status.EVENT)  # Ensure the flag is cleared
@@ -129,7 +350,7 @@ def test_check_event_flag_set_and_clear(rtc):
 
 def test_check_event_flag_set_without_clear(rtc):
     # Set the event flag
-    rtc._set_flag(Reg.STATUS, Status.EVENT, Flag.SET)
+    rtc.i2c_device.i2c.registers[Reg.STATUS] |= Status.EVENT
     assert rtc.check_event_flag(clear=False)  # Check without clearing the flag
     status = rtc._read_register(Reg.STATUS)[0]
     assert status & Status.EVENT  # Ensure the flag is still set
@@ -142,6 +363,19 @@ def test_check_event_flag_not_set(rtc):
     assert not (status & Status.EVENT)  # Ensure the flag is not set
 
 
+def test_get_flag_decodes_multibit_fields(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.EVENT_CONTROL] = 0x20 | EventControl.EVENT_HIGH_LOW_SELECT
+    assert rtc._get_flag(Reg.EVENT_CONTROL, EventControl.EVENT_FILTER) == 2
+    # The size argument no longer affects decoding
+    assert rtc._get_flag(Reg.EVENT_CONTROL, EventControl.EVENT_FILTER, size=0) == 2
+
+    rtc._set_flag(Reg.EEPROM_BACKUP, EEPROMBackup.BACKUP_SWITCHOVER, BSM.LEVEL)
+    assert registers[Reg.EEPROM_BACKUP] == 0x0C
+    with pytest.raises(ValueError):
+        rtc._set_flag(Reg.EEPROM_BACKUP, EEPROMBackup.BACKUP_SWITCHOVER, 4)
+
+
 def test_configure_backup_switchover(rtc):
     rtc.configure_backup_switchover(mode="direct", interrupt=True)
     backup_reg = rtc._read_register(Reg.EEPROM_BACKUP)[0]
@@ -154,7 +388,7 @@ def test_configure_backup_switchover(rtc):
 
 def test_check_backup_switchover_occurred(rtc):
     # Set the backup switchover flag
-    rtc._set_flag(Reg.STATUS, Status.BACKUP_SWITCH, Flag.SET)
+    rtc.i2c_device.i2c.registers[Reg.STATUS] |= Status.BACKUP_SWITCH
     assert rtc.check_backup_switchover()  # Check and clear the flag
     status = rtc._read_register(Reg.STATUS)[0]
     assert not (status & Status.BACKUP_SWITCH)  # Ensure the flag is cleared
@@ -162,7 +396,7 @@ def test_check_backup_switchover_occurred(rtc):
 
 def test_check_backup_switchover_occurred_without_clear(rtc):
     # Set the backup switchover flag
-    rtc._set_flag(Reg.STATUS, Status.BACKUP_SWITCH, Flag.SET)
+    rtc.i2c_device.i2c.registers[Reg.STATUS] |= Status.BACKUP_SWITCH
     assert rtc.check_backup_switchover(clear=False)  # Check without clearing the flag
     status = rtc._read_register(Reg.STATUS)[0]
     assert status & Status.BACKUP_SWITCH  # Ensure the flag is still set
@@ -173,3 +407,521 @@ def test_check_backup_switchover_not_occurred(rtc):
     assert not rtc.check_backup_switchover()  # Check the flag
     status = rtc._read_register(Reg.STATUS)[0]
     assert not (status & Status.BACKUP_SWITCH)  # Ensure the flag is not set
+
+
+def test_cache_serves_config_registers(cached_rtc):
+    registers = cached_rtc.i2c_device.i2c.registers
+    cached_rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
+    registers[Reg.CONTROL2] = 0x00  # Changed behind the driver's back
+    assert cached_rtc._get_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE)
+
+    cached_rtc.invalidate_cache(Reg.CONTROL2)
+    assert not cached_rtc._get_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE)
+
+
+def test_cache_skips_status_register(cached_rtc):
+    registers = cached_rtc.i2c_device.i2c.registers
+    assert not cached_rtc.check_alarm()
+    registers[Reg.STATUS] = Status.ALARM
+    assert cached_rtc.check_alarm()
+
+
+def test_cache_never_holds_self_clearing_bits(cached_rtc):
+    cached_rtc._set_flag(Reg.EVENT_CONTROL, EventControl.TIMESTAMP_RESET, Flag.SET)
+    assert not cached_rtc._get_flag(Reg.EVENT_CONTROL, EventControl.TIMESTAMP_RESET)
+
+
+def test_cache_invalidated_by_eeprom_refresh(cached_rtc):
+    config_eeprom = cached_rtc.i2c_device.i2c.config_eeprom
+    cached_rtc._read_register(Reg.EEPROM_BACKUP)
+    config_eeprom[2] = EEPROMBackup.FEDE  # Reloaded from EEPROM
+    cached_rtc._eecommand(EECMD.REFRESH)
+    assert cached_rtc._get_flag(Reg.EEPROM_BACKUP, EEPROMBackup.FEDE)
+
+
+def _count_writes(rtc, monkeypatch):
+    writes = []
+    write = rtc.i2c_device.write
+
+    def counting_write(data, *, start=0, end=None):
+        writes.append(bytes(data[start:end]))
+        write(data, start=start, end=end)
+
+    monkeypatch.setattr(rtc.i2c_device, "write", counting_write)
+    return writes
+
+
+def test_batch_merges_writes_to_same_register(rtc, monkeypatch):
+    writes = _count_writes(rtc, monkeypatch)
+    with rtc.batch():
+        rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
+        rtc._set_flag(Reg.CONTROL2, Control2.TIMER_INT_ENABLE, Flag.SET)
+        assert rtc._get_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE)
+        assert rtc.i2c_device.i2c.registers[Reg.CONTROL2] == 0x00
+
+    control2 = Control2.ALARM_INT_ENABLE | Control2.TIMER_INT_ENABLE
+    assert rtc.i2c_device.i2c.registers[Reg.CONTROL2] == control2
+    assert [w for w in writes if len(w) > 1] == [bytes([Reg.CONTROL2, control2])]
+
+
+def test_batch_coalesces_adjacent_registers(rtc, monkeypatch):
+    writes = _count_writes(rtc, monkeypatch)
+    with rtc.batch():
+        rtc._write_register(Reg.CONTROL2, bytes([0x02]))
+        rtc._write_register(Reg.CONTROL1, bytes([0x01]))
+        rtc._write_register(Reg.ALARM_MINUTES, bytes([0x03]))
+
+    assert writes == [
+        bytes([Reg.ALARM_MINUTES, 0x03]),
+        bytes([Reg.CONTROL1, 0x01, 0x02]),
+    ]
+
+
+def test_batch_discarded_on_error(rtc):
+    with pytest.raises(ValueError):
+        with rtc.batch():
+            rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
+            rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, 2)
+    assert rtc.i2c_device.i2c.registers[Reg.CONTROL2] == 0x00
+
+
+def test_failed_flush_leaves_no_staged_values(rtc, monkeypatch):
+    def failing_write(data, *, start=0, end=None):
+        raise OSError(5)  # EIO
+
+    monkeypatch.setattr(rtc.i2c_device, "write", failing_write)
+    with pytest.raises(OSError):
+        with rtc.batch():
+            rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
+    monkeypatch.undo()
+
+    assert not rtc._pending
+    assert rtc._read_register(Reg.CONTROL2)[0] == 0x00
+
+
+def test_set_alarm_enables_interrupt(rtc):
+    rtc.set_alarm(minute=30, hour=14, weekday=3)
+    assert rtc._get_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE)
+
+
+def test_service_interrupts_dispatches_and_clears_once(rtc):
+    calls = []
+    rtc.on_interrupt(Status.ALARM, lambda: calls.append("alarm"))
+    rtc.on_interrupt(Status.EVENT, lambda: calls.append("event"))
+    rtc.i2c_device.i2c.registers[Reg.STATUS] = (
+        Status.ALARM | Status.EVENT | Status.TIMER
+    )
+
+    assert rtc.service_interrupts() == Status.ALARM | Status.EVENT | Status.TIMER
+    assert sorted(calls) == ["alarm", "event"]
+    assert rtc.i2c_device.i2c.registers[Reg.STATUS] == Status.TIMER  # Unhandled
+    assert rtc.i2c_device.transactions == 2  # One read, one write
+
+
+def test_service_interrupts_keeps_flags_raised_meanwhile(rtc, monkeypatch):
+    registers = rtc.i2c_device.i2c.registers
+    rtc.on_interrupt(Status.ALARM, lambda: None)
+    registers[Reg.STATUS] = Status.ALARM
+    read = rtc.i2c_device.write_then_readinto
+
+    def read_then_update_flag(*args, **kwargs):
+        read(*args, **kwargs)
+        registers[Reg.STATUS] |= (
+            Status.UPDATE
+        )  # Raised by the 1 Hz update after the read
+
+    monkeypatch.setattr(rtc.i2c_device, "write_then_readinto", read_then_update_flag)
+    rtc.service_interrupts()
+    assert registers[Reg.STATUS] == Status.UPDATE
+
+
+def test_check_flag_clears_only_its_flag(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.STATUS] = Status.ALARM | Status.TIMER | Status.EEBUSY
+    assert rtc.check_alarm()
+    assert registers[Reg.STATUS] == Status.TIMER | Status.EEBUSY
+
+
+def test_service_interrupts_nothing_set(rtc):
+    rtc.on_interrupt(Status.ALARM, lambda: pytest.fail("should not be called"))
+    assert rtc.service_interrupts() == 0
+    assert rtc.i2c_device.transactions == 1
+
+
+def test_on_interrupt_rejects_invalid_flag(rtc):
+    with pytest.raises(ValueError):
+        rtc.on_interrupt(Status.EEBUSY, lambda: None)
+    with pytest.raises(ValueError):
+        rtc.on_interrupt(Status.ALARM | Status.EVENT, lambda: None)
+
+
+class _MockPin:
+    def __init__(self, value=True):
+        self.value = value
+
+
+class _MockCounter:
+    def __init__(self, count=0):
+        self.count = count
+
+    def reset(self):
+        self.count = 0
+
+
+def test_service_interrupts_with_digital_pin(rtc):
+    calls = []
+    rtc.on_interrupt(Status.ALARM, lambda: calls.append("alarm"))
+    pin = _MockPin(value=True)
+    rtc.attach_interrupt_pin(pin)
+    rtc.i2c_device.i2c.registers[Reg.STATUS] = Status.ALARM
+
+    assert rtc.service_interrupts() == 0
+    assert rtc.i2c_device.transactions == 0  # INT high, no bus traffic
+
+    pin.value = False
+    assert rtc.service_interrupts() == Status.ALARM
+    assert calls == ["alarm"]
+
+
+def test_service_interrupts_with_counter(rtc):
+    rtc.on_interrupt(Status.UPDATE, lambda: None)
+    counter = _MockCounter()
+    rtc.attach_interrupt_pin(counter)
+    assert (
+        rtc.service_interrupts() == 0
+    )  # INT may already be low, so STATUS is read once
+
+    transactions = rtc.i2c_device.transactions
+    rtc.i2c_device.i2c.registers[Reg.STATUS] = Status.UPDATE
+    assert rtc.service_interrupts() == 0
+    assert rtc.i2c_device.transactions == transactions  # No new edge, no bus traffic
+    counter.count = 2
+    assert rtc.service_interrupts() == Status.UPDATE
+    assert counter.count == 0
+    assert rtc.service_interrupts(force=True) == 0
+
+
+def test_counter_keeps_reading_while_a_flag_holds_int(rtc):
+    calls = []
+    rtc.on_interrupt(Status.TIMER, lambda: calls.append("timer"))
+    counter = _MockCounter()
+    rtc.attach_interrupt_pin(counter)
+    registers = rtc.i2c_device.i2c.registers
+    rtc.service_interrupts()
+
+    # The alarm has no handler, so its flag stays set and holds INT low: no further edges
+    registers[Reg.STATUS] = Status.ALARM
+    counter.count = 1
+    assert rtc.service_interrupts() == Status.ALARM
+    registers[Reg.STATUS] |= Status.TIMER
+    assert rtc.service_interrupts() == Status.ALARM | Status.TIMER
+    assert calls == ["timer"]
+
+    assert rtc.check_alarm()
+    transactions = rtc.i2c_device.transactions
+    assert rtc.service_interrupts() == 0
+    assert rtc.i2c_device.transactions == transactions
+
+
+@pytest.mark.parametrize(
+    "period, freq, ticks",
+    [
+        (0.5, TimerFreq.FREQ_4096HZ, 2048),
+        (10, TimerFreq.FREQ_64HZ, 640),
+        (100, TimerFreq.FREQ_1HZ, 100),
+        (3 * 3600, TimerFreq.FREQ_60S, 180),
+    ],
+)
+def test_start_countdown_timer_picks_clock(rtc, period, freq, ticks):
+    registers = rtc.i2c_device.i2c.registers
+    assert rtc.start_countdown_timer(period, repeat=True) == period
+    assert registers[Reg.TIMER0] | (registers[Reg.TIMER1] << 8) == ticks
+    assert registers[Reg.CONTROL1] & Control1.FREQ_SELECT == freq
+    assert registers[Reg.CONTROL1] & Control1.TIMER_ENABLE
+    assert registers[Reg.CONTROL1] & Control1.TIMER_REPEAT
+    assert not registers[Reg.CONTROL2] & Control2.TIMER_INT_ENABLE
+
+
+def test_start_countdown_timer_explicit_freq(rtc):
+    assert rtc.start_countdown_timer(2.5, freq=TimerFreq.FREQ_1HZ, interrupt=True) == 2
+    registers = rtc.i2c_device.i2c.registers
+    assert registers[Reg.CONTROL1] & Control1.FREQ_SELECT == TimerFreq.FREQ_1HZ
+    assert registers[Reg.CONTROL2] & Control2.TIMER_INT_ENABLE
+
+
+def test_start_countdown_timer_out_of_range(rtc):
+    with pytest.raises(ValueError):
+        rtc.start_countdown_timer(0.0001)
+    with pytest.raises(ValueError):
+        rtc.start_countdown_timer(4096 * 60)
+    with pytest.raises(ValueError):
+        rtc.start_countdown_timer(100, freq=TimerFreq.FREQ_4096HZ)
+
+
+def test_stop_countdown_timer(rtc):
+    rtc.start_countdown_timer(1)
+    rtc.stop_countdown_timer()
+    assert not rtc._get_flag(Reg.CONTROL1, Control1.TIMER_ENABLE)
+
+
+def test_get_timer_remaining(rtc):
+    rtc.start_countdown_timer(10)
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.TIMER_STATUS0] = 0x40
+    registers[Reg.TIMER_STATUS1] = 0x01  # 320 ticks at 64 Hz
+    rtc.i2c_device.transactions = 0
+    assert rtc.get_timer_remaining() == 5
+    assert rtc.i2c_device.transactions == 1
+
+
+def test_check_timer(rtc):
+    rtc.i2c_device.i2c.registers[Reg.STATUS] |= Status.TIMER
+    assert rtc.check_timer(clear=False)
+    assert rtc.check_timer()
+    assert not rtc.check_timer()
+
+
+def test_configure_update_interrupt(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.STATUS] = Status.UPDATE
+    rtc.configure_update_interrupt(per="minute")
+    assert registers[Reg.CONTROL1] & Control1.UPDATE_INT_SELECT
+    assert registers[Reg.CONTROL2] & Control2.UPDATE_INT_ENABLE
+    assert not registers[Reg.STATUS] & Status.UPDATE
+
+    rtc.configure_update_interrupt(per="second")
+    assert not registers[Reg.CONTROL1] & Control1.UPDATE_INT_SELECT
+
+    rtc.configure_update_interrupt(enable=False)
+    assert not registers[Reg.CONTROL2] & Control2.UPDATE_INT_ENABLE
+
+    with pytest.raises(ValueError):
+        rtc.configure_update_interrupt(per="hour")
+
+
+def test_check_update(rtc):
+    rtc.i2c_device.i2c.registers[Reg.STATUS] |= Status.UPDATE
+    assert rtc.check_update(clear=False)
+    assert rtc.check_update()
+    assert not rtc.check_update()
+
+
+def test_apply_eeprom_config(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    assert rtc.apply_eeprom_config(
+        trickle=5000, backup="level", backup_interrupt=True, clkout=0xC5, offset=-3
+    )
+    assert registers[Reg.EECMD] == EECMD.UPDATE
+    assert registers[Reg.EEPROM_CLKOUT] == 0xC5
+    assert registers[Reg.EEPROM_OFFSET] == 0xFE  # -3 = 0x1FD, bits 8-1
+    backup = registers[Reg.EEPROM_BACKUP]
+    assert backup & EEPROMBackup.TRICKLE_CHARGE_ENABLE
+    assert backup & EEPROMBackup.TRICKLE_CHARGE_RES == Resistance.RES_5000
+    assert backup & EEPROMBackup.BACKUP_SWITCHOVER == BSM.LEVEL << 2
+    assert backup & EEPROMBackup.BACKUP_SWITCHOVER_INT_ENABLE
+    assert backup & EEPROMBackup.FEDE
+    assert backup & EEPROMBackup.EEOFFSET_LSB
+    assert not rtc._get_flag(Reg.CONTROL1, Control1.EEPROM_REFRESH_DISABLE)
+
+
+def test_apply_eeprom_config_skips_unchanged(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    assert rtc.apply_eeprom_config(trickle=9000, backup="direct")
+    registers[Reg.EECMD] = 0
+    transactions = rtc.i2c_device.transactions
+
+    assert not rtc.apply_eeprom_config(trickle=9000, backup="direct")
+    assert registers[Reg.EECMD] == 0  # No EEPROM cycle
+    assert rtc.i2c_device.transactions == transactions + 1  # Only the burst read
+
+
+def test_apply_eeprom_config_invalid(rtc):
+    with pytest.raises(ValueError):
+        rtc.apply_eeprom_config(trickle=1234)
+    with pytest.raises(ValueError):
+        rtc.apply_eeprom_config(backup="sometimes")
+    with pytest.raises(ValueError):
+        rtc.apply_eeprom_config(offset=256)
+    with pytest.raises(ValueError):
+        rtc.apply_eeprom_config(clkout=0x100)
+
+
+class _RecordingLock:
+    def __init__(self):
+        self.held = False
+        self.acquisitions = 0
+
+    def acquire(self):
+        assert not self.held, "lock is not re-entrant"
+        self.held = True
+        self.acquisitions += 1
+
+    def release(self):
+        assert self.held
+        self.held = False
+
+
+@pytest.fixture
+def locked_rtc():
+    i2c_bus = MockI2C()
+    i2c_device = MockI2CDevice(i2c_bus, 0x52)
+    lock = _RecordingLock()
+    rtc = RV3028(i2c_device, lock=lock)
+    return rtc, lock
+
+
+def test_lock_held_across_read_modify_write(locked_rtc):
+    rtc, lock = locked_rtc
+    rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
+    assert lock.acquisitions == 1
+    assert rtc.i2c_device.transactions == 2
+    assert not lock.held
+
+
+def test_lock_held_across_compound_operations(locked_rtc):
+    rtc, lock = locked_rtc
+    rtc.set_alarm(minute=30, hour=14, weekday=3)
+    assert lock.acquisitions == 1
+
+    lock.acquisitions = 0
+    rtc.configure_backup_switchover(mode="level")
+    assert lock.acquisitions > 1  # Released between EEPROM busy polls
+    assert not lock.held
+
+
+def test_lock_released_on_error(locked_rtc):
+    rtc, lock = locked_rtc
+    with pytest.raises(ValueError):
+        with rtc.batch():
+            rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, 2)
+    assert not lock.held
+
+
+def test_bus_stats(rtc):
+    rtc = RV3028(rtc.i2c_device, lock=_RecordingLock(), stats=True)
+    rtc.get_datetime()
+    rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
+    stats = rtc.bus_stats()
+    assert stats["acquisitions"] == 2
+    assert stats["hold_ns_max"] <= stats["hold_ns_total"]
+    assert stats["wait_ns_max"] <= stats["wait_ns_total"]
+
+    rtc.reset_bus_stats()
+    assert rtc.bus_stats() == {
+        "acquisitions": 0,
+        "wait_ns_total": 0,
+        "wait_ns_max": 0,
+        "hold_ns_total": 0,
+        "hold_ns_max": 0,
+    }
+
+
+def test_bus_stats_off_by_default(rtc, monkeypatch):
+    def monotonic_ns():
+        pytest.fail("bus access should not be timed without stats=True")
+
+    monkeypatch.setattr(rv3028_module.time, "monotonic_ns", monotonic_ns)
+    rtc.get_datetime()
+    rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
+    monkeypatch.undo()
+    assert rtc.bus_stats()["acquisitions"] == 0
+
+
+def test_lock_shared_between_threads(rtc):
+    rtc = RV3028(rtc.i2c_device, lock=threading.Lock(), stats=True)
+
+    def toggle(mask):
+        for _ in range(200):
+            rtc._set_flag(Reg.CONTROL2, mask, Flag.SET)
+
+    threads = [
+        threading.Thread(target=toggle, args=(mask,))
+        for mask in (Control2.ALARM_INT_ENABLE, Control2.TIMER_INT_ENABLE)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert rtc._get_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE)
+    assert rtc._get_flag(Reg.CONTROL2, Control2.TIMER_INT_ENABLE)
+    assert rtc.bus_stats()["acquisitions"] == 402
+
+
+def test_batch_is_private_to_its_thread(rtc):
+    rtc = RV3028(rtc.i2c_device, lock=threading.Lock())
+    registers = rtc.i2c_device.i2c.registers
+    in_batch = threading.Event()
+    order = []
+
+    def batch_then_fail():
+        with pytest.raises(RuntimeError):
+            with rtc.batch():
+                rtc._set_flag(Reg.CONTROL2, Control2.ALARM_INT_ENABLE, Flag.SET)
+                in_batch.set()
+                time.sleep(0.05)  # Let the other thread try to use the bus
+                order.append("batch")
+                raise RuntimeError
+
+    def set_time():
+        in_batch.wait()
+        rtc.set_time(12, 34, 56)
+        order.append("set_time")
+
+    threads = [
+        threading.Thread(target=batch_then_fail),
+        threading.Thread(target=set_time),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert order == ["batch", "set_time"]  # Waited for the batch to release the bus
+    assert registers[Reg.SECONDS : Reg.HOURS + 1] == [0x56, 0x34, 0x12]
+    assert registers[Reg.CONTROL2] == 0x00
+
+
+class _InterleavingLock:
+    """
+    A bus lock that runs `on_release` once, right after the next release, so another thread can
+    use the bus at exactly that point.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.on_release = None
+
+    def acquire(self):
+        self._lock.acquire()
+
+    def release(self):
+        self._lock.release()
+        callback, self.on_release = self.on_release, None
+        if callback is not None:
+            callback()
+
+
+def test_getters_decode_before_releasing_the_bus(rtc):
+    lock = _InterleavingLock()
+    rtc = RV3028(rtc.i2c_device, lock=lock)
+    rtc.set_datetime((2024, 3, 1, 12, 34, 56, 4, 0, -1))
+    rtc.set_alarm(minute=30, hour=6)
+    rtc.write_scratch(0x12345)
+    rtc.set_unix_time(0x01020304)
+
+    def read_unix_time_in_another_thread():
+        # Overwrites the shared receive buffer if the getter has not decoded it yet
+        thread = threading.Thread(target=rtc.get_unix_time)
+        thread.start()
+        thread.join()
+
+    for getter, expected in (
+        (rtc.get_time, (12, 34, 56)),
+        (rtc.get_date, (24, 3, 1, 5)),
+        (lambda: tuple(rtc.get_datetime())[:6], (2024, 3, 1, 12, 34, 56)),
+        (rtc.get_alarm, (30, 6, None)),
+        (rtc.read_scratch, 0x12345),
+        (lambda: rtc.alarm_interrupt_enabled, True),
+    ):
+        lock.on_release = read_unix_time_in_another_thread
+        assert getter() == expected
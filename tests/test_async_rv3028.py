@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+from rv3028.async_rv3028 import AsyncRV3028
+from rv3028.registers import EECMD, EEPROMBackup, Reg, Resistance, Status
+
+
+def test_set_and_get_time(async_rtc):
+    async def main():
+        await async_rtc.set_time(23, 59, 58)
+        return await async_rtc.get_time()
+
+    assert asyncio.run(main()) == (23, 59, 58)
+
+
+def test_set_and_get_datetime(async_rtc):
+    async def main():
+        await async_rtc.set_datetime((2024, 3, 1, 23, 59, 58, 4, 0, -1))
+        return await async_rtc.get_datetime()
+
+    assert tuple(asyncio.run(main()))[:7] == (2024, 3, 1, 23, 59, 58, 4)
+
+
+def test_enable_trickle_charger_yields_during_eeprom_cycle(async_rtc):
+    registers = async_rtc.rtc.i2c_device.i2c.registers
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        await async_rtc.enable_trickle_charger(resistance=15000)
+        task.cancel()
+
+    asyncio.run(main())
+    assert ticks  # The other task ran while waiting for the EEPROM
+    assert registers[Reg.EECMD] == EECMD.UPDATE
+    backup = registers[Reg.EEPROM_BACKUP]
+    assert backup & EEPROMBackup.TRICKLE_CHARGE_ENABLE
+    assert backup & EEPROMBackup.TRICKLE_CHARGE_RES == Resistance.RES_15000
+
+
+def test_apply_eeprom_config_unchanged(async_rtc):
+    async def main():
+        await async_rtc.configure_backup_switchover(mode="direct")
+        return await async_rtc.apply_eeprom_config(
+            backup="direct", backup_interrupt=False
+        )
+
+    assert asyncio.run(main()) is False
+
+
+def test_interrupts_iterator(async_rtc):
+    registers = async_rtc.rtc.i2c_device.i2c.registers
+
+    async def raise_alarm():
+        await asyncio.sleep(0.02)
+        registers[Reg.STATUS] = Status.ALARM | Status.TIMER
+
+    async def main():
+        asyncio.create_task(raise_alarm())
+        async for flags in async_rtc.interrupts(poll_interval=0.001):
+            return flags
+
+    assert asyncio.run(main()) == Status.ALARM
+    assert registers[Reg.STATUS] == Status.TIMER  # Only requested flags are cleared
+
+
+def test_lock_and_stats_passed_through(async_rtc):
+    lock = threading.Lock()
+    shared = AsyncRV3028(async_rtc.rtc.i2c_device, lock=lock, stats=True)
+    assert shared.rtc._bus._lock is lock
+    asyncio.run(shared.get_time())
+    assert shared.rtc.bus_stats()["acquisitions"] == 1
+
+
+def test_concurrent_eeprom_updates_take_turns(async_rtc):
+    registers = async_rtc.rtc.i2c_device.i2c.registers
+
+    async def main():
+        return await asyncio.gather(
+            async_rtc.enable_trickle_charger(resistance=15000),
+            async_rtc.apply_eeprom_config(clkout=0x05),
+        )
+
+    asyncio.run(main())
+    backup = registers[Reg.EEPROM_BACKUP]
+    assert backup & EEPROMBackup.TRICKLE_CHARGE_ENABLE
+    assert registers[Reg.EEPROM_CLKOUT] == 0x05
+    assert async_rtc.rtc.i2c_device.i2c.config_eeprom[0] == 0x05
+    assert async_rtc.rtc._eeprom_command is None
@@ -0,0 +1,39 @@
+import pytest
+
+from rv3028.bcd import (
+    BCD_DECODE,
+    BCD_ENCODE,
+    bcd_to_int,
+    decode_bcd_into,
+    encode_bcd_into,
+    int_to_bcd,
+)
+
+
+def test_tables_match_arithmetic():
+    assert len(BCD_DECODE) == 256
+    assert len(BCD_ENCODE) == 100
+    for bcd in range(256):
+        assert bcd_to_int(bcd) == (bcd & 0x0F) + ((bcd >> 4) * 10)
+    for value in range(100):
+        assert int_to_bcd(value) == ((value // 10) << 4) | (value % 10)
+        assert bcd_to_int(int_to_bcd(value)) == value
+
+
+def test_int_to_bcd_out_of_range():
+    with pytest.raises(ValueError):
+        int_to_bcd(100)
+    with pytest.raises(ValueError):
+        int_to_bcd(-1)
+
+
+def test_decode_bcd_into_in_place():
+    data = bytearray([0x07, 0x58, 0x59, 0x23, 0x31, 0x12, 0x99])
+    decode_bcd_into(data, data, 1, 7)
+    assert data == bytearray([0x07, 58, 59, 23, 31, 12, 99])
+
+
+def test_encode_bcd_into():
+    dst = bytearray(3)
+    encode_bcd_into([59, 30, 23], dst)
+    assert dst == bytearray([0x59, 0x30, 0x23])
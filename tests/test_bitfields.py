@@ -0,0 +1,91 @@
+import pytest
+
+from rv3028.bitfields import ROBit, RWBit, RWBits
+from rv3028.registers import (
+    ID,
+    ClockIntOn,
+    Control1,
+    Control2,
+    EventFilter,
+    Reg,
+    Status,
+    TimerFreq,
+)
+
+
+def test_shift_and_width_precomputed():
+    field = RWBits(Reg.EVENT_CONTROL, 0x30)
+    assert (field.shift, field.width, field.max_value) == (4, 2, 3)
+    assert RWBits.__get__(field, None) is field
+    with pytest.raises(ValueError):
+        RWBits(Reg.CONTROL1, 0x05)  # Not contiguous
+    with pytest.raises(ValueError):
+        RWBits(Reg.CONTROL1, 0)
+    with pytest.raises(ValueError):
+        RWBit(Reg.CONTROL1, 0x03)
+    with pytest.raises(ValueError):
+        ROBit(Reg.ID, ID.HID)
+
+
+def test_rwbit(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.CONTROL2] = Control2.HOUR_MODE
+    rtc.timer_interrupt_enabled = True
+    assert registers[Reg.CONTROL2] == Control2.HOUR_MODE | Control2.TIMER_INT_ENABLE
+    assert rtc.timer_interrupt_enabled is True
+    rtc.twelve_hour_mode = False
+    assert registers[Reg.CONTROL2] == Control2.TIMER_INT_ENABLE
+    with pytest.raises(ValueError):
+        rtc.timer_interrupt_enabled = 2
+
+
+def test_rwbits(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.CONTROL1] = Control1.TIMER_REPEAT
+    rtc.timer_frequency = TimerFreq.FREQ_60S
+    assert rtc.timer_frequency == TimerFreq.FREQ_60S
+    assert registers[Reg.CONTROL1] == Control1.TIMER_REPEAT | TimerFreq.FREQ_60S
+
+    rtc.event_filter = EventFilter.FILTER_64Hz
+    assert registers[Reg.EVENT_CONTROL] == 0x20
+    rtc.clock_interrupt_mask = ClockIntOn.ALARM | ClockIntOn.EVENT
+    assert registers[Reg.CLOCK_INT_MASK] == 0x0C
+    with pytest.raises(ValueError):
+        rtc.timer_frequency = 4
+    with pytest.raises(ValueError):
+        rtc.event_filter = -1
+
+
+def test_read_only_fields(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.ID] = 0x31
+    registers[Reg.STATUS] = Status.PORF
+    assert rtc.hardware_id == 3
+    assert rtc.version_id == 1
+    assert rtc.power_on_reset is True
+    assert rtc.eeprom_busy is False
+    with pytest.raises(AttributeError):
+        rtc.power_on_reset = False
+    with pytest.raises(AttributeError):
+        rtc.hardware_id = 1
+
+
+def test_fields_use_cache(cached_rtc):
+    cached_rtc.timer_enabled = True
+    before = cached_rtc.i2c_device.transactions
+    assert cached_rtc.timer_enabled
+    cached_rtc.timer_repeat = True
+    assert cached_rtc.i2c_device.transactions == before + 1  # Only the write
+
+
+def test_fields_batch(rtc):
+    before = rtc.i2c_device.transactions
+    with rtc.batch():
+        rtc.alarm_interrupt_enabled = True
+        rtc.timestamp_enabled = True
+        assert rtc.alarm_interrupt_enabled
+    registers = rtc.i2c_device.i2c.registers
+    assert registers[Reg.CONTROL2] == Control2.ALARM_INT_ENABLE | (
+        Control2.TIMESTAMP_ENABLE
+    )
+    assert rtc.i2c_device.transactions == before + 2  # One read, one write
@@ -0,0 +1,61 @@
+import pytest
+from mocks.i2cMock import MockDriftingClock
+
+from rv3028.calibration import DriftCalibrator
+from rv3028.registers import EECMD, Reg
+
+
+def _sample_for_a_week(calibrator, clock):
+    for _ in range(7 * 24):
+        clock.advance(3600)
+        calibrator.sample(clock.reference)
+
+
+def test_record_fits_drift(rtc):
+    calibrator = DriftCalibrator(rtc)
+    assert calibrator.drift_ppm is None
+    for step in range(10):
+        reference = 1700000000 + step * 1000000
+        calibrator.record(reference + step * 25, reference)
+    assert calibrator.drift_ppm == pytest.approx(25, abs=0.5)
+
+
+def test_calibrate_against_drifting_clock(rtc):
+    clock = MockDriftingClock(rtc.i2c_device.i2c, ppm=20)
+    calibrator = DriftCalibrator(rtc)
+    calibrator.sample(clock.reference)
+    _sample_for_a_week(calibrator, clock)
+    assert calibrator.drift_ppm == pytest.approx(20, abs=0.5)
+
+    offset = calibrator.apply()
+    assert offset == 21
+    assert rtc.get_eeprom_offset() == 21
+    assert rtc.i2c_device.i2c.registers[Reg.EECMD] == EECMD.UPDATE
+    assert calibrator.count == 0
+
+    # The corrected clock keeps time
+    calibrator.sample(clock.reference)
+    _sample_for_a_week(calibrator, clock)
+    assert abs(calibrator.drift_ppm) < 1
+
+
+def test_apply_adds_to_current_offset(rtc):
+    clock = MockDriftingClock(rtc.i2c_device.i2c, ppm=-30)
+    rtc.apply_eeprom_config(offset=-10)
+    calibrator = DriftCalibrator(rtc)
+    calibrator.sample(clock.reference)
+    _sample_for_a_week(calibrator, clock)
+    assert calibrator.apply() == -10 + round((-30 + 10 * 0.9537) / 0.9537)
+
+
+def test_offset_correction_needs_samples(rtc):
+    calibrator = DriftCalibrator(rtc)
+    calibrator.record(100, 100)
+    with pytest.raises(ValueError):
+        calibrator.offset_correction()
+
+
+def test_get_eeprom_offset(rtc):
+    for offset in (-256, -1, 0, 1, 255):
+        rtc.apply_eeprom_config(offset=offset)
+        assert rtc.get_eeprom_offset() == offset
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from rv3028.eeprom import EEPROMCommand
+from rv3028.registers import EECMD, Control1, Reg, Status
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += int(seconds * 1000000000)
+
+
+def test_command_completes_when_idle(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    clock = FakeClock()
+    command = EEPROMCommand(rtc, EECMD.UPDATE, clock=clock)
+
+    assert not command.poll()  # Command issued, waiting for completion
+    assert registers[Reg.EECMD] == EECMD.UPDATE
+    assert registers[Reg.CONTROL1] & Control1.EEPROM_REFRESH_DISABLE
+
+    clock.advance(command.delay)
+    assert command.poll()
+    assert command.done
+    assert not registers[Reg.CONTROL1] & Control1.EEPROM_REFRESH_DISABLE
+
+
+def test_command_backs_off_while_busy(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.STATUS] = Status.EEBUSY
+    clock = FakeClock()
+    command = EEPROMCommand(rtc, EECMD.UPDATE, clock=clock)
+
+    assert not command.poll()
+    assert registers[Reg.EECMD] == 0  # Not issued while the EEPROM is busy
+
+    transactions = rtc.i2c_device.transactions
+    assert not command.poll()
+    assert rtc.i2c_device.transactions == transactions  # Back-off, no bus traffic
+
+    first_delay = command.delay
+    clock.advance(first_delay)
+    assert not command.poll()
+    assert command.delay == 2 * first_delay  # Exponential back-off
+
+    registers[Reg.STATUS] = 0
+    clock.advance(command.delay)
+    assert not command.poll()
+    assert registers[Reg.EECMD] == EECMD.UPDATE
+
+    clock.advance(command.delay)
+    assert command.poll()
+
+
+def test_command_times_out(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.STATUS] = Status.EEBUSY
+    clock = FakeClock()
+    command = EEPROMCommand(rtc, EECMD.UPDATE, timeout=0.01, clock=clock)
+    command.poll()
+    assert registers[Reg.CONTROL1] & Control1.EEPROM_REFRESH_DISABLE
+    clock.advance(1)
+    with pytest.raises(RuntimeError):
+        command.poll()
+
+    # The automatic refresh is re-enabled and the device is free again
+    assert not registers[Reg.CONTROL1] & Control1.EEPROM_REFRESH_DISABLE
+    registers[Reg.STATUS] = 0
+    rtc.start_eecommand(EECMD.REFRESH).run()
+
+
+def test_one_command_at_a_time(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    command = rtc.start_eecommand(EECMD.UPDATE)
+    command.poll()
+    with pytest.raises(RuntimeError):
+        rtc.start_eecommand(EECMD.REFRESH)
+
+    command.cancel()
+    assert not registers[Reg.CONTROL1] & Control1.EEPROM_REFRESH_DISABLE
+    with pytest.raises(RuntimeError):
+        command.poll()
+    rtc.start_eecommand(EECMD.REFRESH).run()
+
+
+def test_start_eecommand_run(rtc):
+    command = rtc.start_eecommand(EECMD.REFRESH)
+    command.run()
+    assert command.done
+
+
+def test_command_wait_async(rtc):
+    command = rtc.start_eecommand(EECMD.UPDATE)
+    asyncio.run(command.wait())
+    assert command.done
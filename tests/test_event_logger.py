@@ -0,0 +1,117 @@
+import pytest
+
+from rv3028.event_logger import EventLogger
+from rv3028.registers import Control2, EventControl, Reg, Status
+
+
+def _raise_event(rtc, count, seconds):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.TIMESTAMP_COUNT : Reg.TIMESTAMP_YEAR + 1] = [
+        count,
+        rtc._int_to_bcd(seconds),
+        rtc._int_to_bcd(20),  # minutes
+        rtc._int_to_bcd(12),  # hours
+        rtc._int_to_bcd(25),  # date
+        rtc._int_to_bcd(9),  # month
+        rtc._int_to_bcd(21),  # year
+    ]
+    registers[Reg.STATUS] |= Status.EVENT
+
+
+def test_start_configures_time_stamping(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    EventLogger(rtc, overwrite=True).start()
+    assert registers[Reg.EVENT_CONTROL] & EventControl.TIMESTAMP_OVERWRITE
+    assert registers[Reg.EVENT_CONTROL] & EventControl.TIMESTAMP_RESET
+    assert not registers[Reg.EVENT_CONTROL] & EventControl.TIMESTAMP_SOURCE_SELECT
+    assert registers[Reg.CONTROL2] & Control2.TIMESTAMP_ENABLE
+    assert registers[Reg.CONTROL2] & Control2.EVENT_INT_ENABLE
+
+
+def test_backup_source(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    logger = EventLogger(rtc, source="backup")
+    logger.start()
+    assert registers[Reg.EVENT_CONTROL] & EventControl.TIMESTAMP_SOURCE_SELECT
+    assert not registers[Reg.CONTROL2] & Control2.EVENT_INT_ENABLE
+    assert logger.flag == Status.BACKUP_SWITCH
+
+    with pytest.raises(ValueError):
+        EventLogger(rtc, source="radio")
+
+
+def test_capture_from_interrupt(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    logger = EventLogger(rtc)
+    logger.start()
+
+    _raise_event(rtc, count=3, seconds=10)
+    registers[Reg.EVENT_CONTROL] = 0
+    rtc.service_interrupts()
+
+    assert not registers[Reg.STATUS] & Status.EVENT
+    assert registers[Reg.EVENT_CONTROL] & EventControl.TIMESTAMP_RESET
+    assert len(logger) == 1
+    assert logger.pop() == (21, 9, 25, 12, 20, 10, 3)
+    assert len(logger) == 0
+    assert logger.events == 3
+    assert logger.captured == 1
+
+
+def test_capture_without_event(rtc):
+    logger = EventLogger(rtc)
+    assert not logger.capture()
+    assert len(logger) == 0
+    with pytest.raises(IndexError):
+        logger.pop()
+
+
+def test_ring_buffer_overflow(rtc):
+    logger = EventLogger(rtc, capacity=2)
+    for seconds in (1, 2, 3):
+        _raise_event(rtc, count=1, seconds=seconds)
+        assert logger.capture()
+
+    assert logger.dropped == 1
+    entry = bytearray(7)
+    assert logger.pop_into(entry)
+    assert entry[5] == 2
+    assert logger.pop()[5] == 3
+    assert not logger.pop_into(entry)
+
+
+def test_event_rate(rtc):
+    now = [0]
+    logger = EventLogger(rtc, clock=lambda: now[0])
+    assert logger.event_rate() == 0.0
+    _raise_event(rtc, count=4, seconds=0)
+    logger.capture()
+    now[0] = 2000000000
+    assert logger.event_rate() == 2.0
+
+    logger.reset_stats()
+    assert logger.events == 0
+
+
+def test_stop(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    logger = EventLogger(rtc)
+    logger.start()
+    transactions = rtc.i2c_device.transactions
+    logger.stop()
+    assert not registers[Reg.CONTROL2] & Control2.TIMESTAMP_ENABLE
+    assert not registers[Reg.CONTROL2] & Control2.EVENT_INT_ENABLE
+    assert rtc.i2c_device.transactions == transactions + 2  # One read, one write
+    _raise_event(rtc, count=1, seconds=1)
+    rtc.service_interrupts()
+    assert len(logger) == 0
+
+
+def test_stop_keeps_event_interrupt_it_did_not_enable(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    rtc.configure_evi()
+    logger = EventLogger(rtc, source="backup")
+    logger.start()
+    logger.stop()
+    assert not registers[Reg.CONTROL2] & Control2.TIMESTAMP_ENABLE
+    assert registers[Reg.CONTROL2] & Control2.EVENT_INT_ENABLE
@@ -0,0 +1,196 @@
+import calendar
+
+import pytest
+
+from rv3028.fused_clock import FusedClock
+from rv3028.registers import Reg
+
+START = 1700000000
+
+
+class SimulatedTime:
+    """
+    Reference time driving the mock RTC's Unix counter, and an MCU tick counter with a rate error.
+    Every tick read advances time by 100 us.
+    """
+
+    def __init__(self, registers, mcu_ppm=0, start_ns=400000000):
+        self.registers = registers
+        self.mcu_ppm = mcu_ppm
+        self.now = start_ns  # True nanoseconds since START
+        self.rtc_step = 0  # Seconds the RTC time has been stepped by
+        self._update_rtc()
+
+    def _update_rtc(self):
+        seconds = START + self.rtc_step + self.now // 1000000000
+        self.registers[Reg.UNIX_TIME0 : Reg.UNIX_TIME3 + 1] = [
+            (seconds >> shift) & 0xFF for shift in (0, 8, 16, 24)
+        ]
+
+    def advance(self, ns):
+        self.now += ns
+        self._update_rtc()
+
+    def step_rtc(self, seconds):
+        self.rtc_step += seconds
+        self._update_rtc()
+
+    def true_ns(self):
+        return (START + self.rtc_step) * 1000000000 + self.now
+
+    def __call__(self):
+        self.advance(100000)
+        return int(self.now * (1 + self.mcu_ppm / 1e6))
+
+    def sleep(self, seconds):
+        self.advance(int(seconds * 1000000000))
+
+
+def test_sync_anchors_at_second_boundary(rtc):
+    world = SimulatedTime(rtc.i2c_device.i2c.registers)
+    clock = FusedClock(rtc, source="unix", ticks=world, sleep=world.sleep)
+    clock.sync()
+    assert clock.synced
+
+    transactions = rtc.i2c_device.transactions
+    world.advance(250000000)
+    assert abs(clock.time_ns() - world.true_ns()) < 1000000
+    assert rtc.i2c_device.transactions == transactions  # No bus traffic
+
+
+def test_drift_tracking(rtc):
+    world = SimulatedTime(rtc.i2c_device.i2c.registers, mcu_ppm=50)
+    clock = FusedClock(
+        rtc, source="unix", ticks=world, sleep=world.sleep, resync_interval=0
+    )
+    clock.sync()
+    world.advance(100 * 1000000000)
+    clock.sync()
+    assert clock.drift_ppm == pytest.approx(50, abs=5)
+
+    world.advance(30 * 1000000000)
+    assert abs(clock.time_ns() - world.true_ns()) < 1000000
+
+
+def test_time_ns_requires_sync(rtc):
+    clock = FusedClock(rtc, source="unix")
+    with pytest.raises(RuntimeError):
+        clock.time_ns()
+
+
+def test_time_ns_resyncs_without_blocking(rtc):
+    world = SimulatedTime(rtc.i2c_device.i2c.registers)
+    clock = FusedClock(
+        rtc, source="unix", ticks=world, sleep=world.sleep, resync_interval=10
+    )
+    clock.sync()
+    anchor = clock._anchor_ticks
+
+    world.advance(20 * 1000000000)
+    for _ in range(1100):
+        transactions = rtc.i2c_device.transactions
+        assert abs(clock.time_ns() - world.true_ns()) < 1000000
+        # One register read per poll, plus the full read when the boundary is seen
+        assert rtc.i2c_device.transactions - transactions <= 2
+        if clock._anchor_ticks != anchor:
+            break
+        world.advance(1000000)
+    assert clock._anchor_ticks != anchor  # Resynced within a second
+
+
+def test_monotonic_across_resync(rtc):
+    # 200 ppm fast: the estimate is 720 ms ahead of the RTC at the first hourly resync
+    world = SimulatedTime(rtc.i2c_device.i2c.registers, mcu_ppm=200)
+    clock = FusedClock(rtc, source="unix", ticks=world, sleep=world.sleep)
+    clock.sync()
+    anchor = clock._anchor_ticks
+
+    world.advance(3600 * 1000000000)
+    last = clock.time_ns()
+    for _ in range(3000):
+        world.advance(1000000)
+        now = clock.time_ns()
+        assert now >= last
+        last = now
+    assert clock._anchor_ticks != anchor
+    assert clock.drift_ppm == pytest.approx(200, abs=1)
+
+    # The correction has been slewed in after 720 ms / 500 ppm = 1440 s
+    world.advance(1500 * 1000000000)
+    assert abs(clock.time_ns() - world.true_ns()) < 1000000
+
+
+@pytest.mark.parametrize("step", [3600, -3600])
+def test_rtc_time_step(rtc, step):
+    world = SimulatedTime(rtc.i2c_device.i2c.registers, mcu_ppm=50)
+    clock = FusedClock(rtc, source="unix", ticks=world, sleep=world.sleep)
+    clock.sync()
+    world.advance(20 * 1000000000)
+    clock.sync()
+    assert clock.drift_ppm == pytest.approx(50, abs=5)
+
+    world.step_rtc(step)
+    clock.sync()
+    assert clock.drift_ppm == 0  # Restarted, not skewed by the step
+    assert abs(clock.time_ns() - world.true_ns()) < 1000000  # Stepped, not slewed
+    world.advance(10 * 1000000000)
+    assert abs(clock.time_ns() - world.true_ns()) < 1000000
+
+
+def test_drift_estimate_is_bounded(rtc):
+    # 5000 ppm is no crystal: the 100 ms it adds over 20 s is below the step threshold
+    world = SimulatedTime(rtc.i2c_device.i2c.registers, mcu_ppm=5000)
+    clock = FusedClock(rtc, source="unix", ticks=world, sleep=world.sleep)
+    clock.sync()
+    world.advance(20 * 1000000000)
+    clock.sync()
+    assert clock.drift_ppm == 1000
+
+
+def test_reset_and_resync(rtc):
+    world = SimulatedTime(rtc.i2c_device.i2c.registers)
+    clock = FusedClock(rtc, source="unix", ticks=world, sleep=world.sleep)
+    clock.sync()
+    clock.time_ns()
+
+    world.step_rtc(-3600)
+    clock.reset()
+    assert not clock.synced
+    with pytest.raises(RuntimeError):
+        clock.time_ns()
+
+    clock.resync()
+    assert abs(clock.time_ns() - world.true_ns()) < 1000000
+
+
+def test_sync_timeout(rtc):
+    now = [0]
+
+    def ticks():
+        now[0] += 100000000
+        return now[0]
+
+    clock = FusedClock(rtc, ticks=ticks)
+    with pytest.raises(RuntimeError):
+        clock.sync()
+
+
+def test_on_update_with_calendar(rtc):
+    rtc.set_datetime((2024, 3, 1, 23, 59, 58, 4, 0, -1))
+    clock = FusedClock(rtc, ticks=lambda: 5000)
+    clock.on_update()
+    assert clock.time_ns() == calendar.timegm((2024, 3, 1, 23, 59, 58)) * 1000000000
+
+
+def test_on_update_with_edge_ticks(rtc):
+    world = SimulatedTime(rtc.i2c_device.i2c.registers, start_ns=0)
+    clock = FusedClock(rtc, source="unix", ticks=world)
+    edge = world()
+    world.advance(3000000)  # Handler latency
+    clock.on_update(ticks=edge)
+    assert abs(clock.time_ns() - world.true_ns()) < 1000000
+
+
+def test_invalid_source(rtc):
+    with pytest.raises(ValueError):
+        FusedClock(rtc, source="gps")
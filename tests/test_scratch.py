@@ -0,0 +1,85 @@
+import pytest
+
+from rv3028.registers import Reg
+from rv3028.scratch import ScratchState
+
+_LAYOUT = (("boot_phase", 3), ("watchdog_reason", 4), ("safe_mode", 1), ("boots", 15))
+
+
+def _record_writes(rtc, monkeypatch):
+    writes = []
+    original = rtc.i2c_device.write
+
+    def write(data, *, start=0, end=None):
+        writes.append(bytes(data[start:end]))
+        original(data, start=start, end=end)
+
+    monkeypatch.setattr(rtc.i2c_device, "write", write)
+    return writes
+
+
+def test_read_scratch_is_one_transaction(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.GP_BITS] = 0x80 | 0x15
+    registers[Reg.RAM1] = 0xAB
+    registers[Reg.RAM2] = 0xCD
+    before = rtc.i2c_device.transactions
+    assert rtc.read_scratch() == 0x15 | (0xAB << 7) | (0xCD << 15)
+    assert rtc.i2c_device.transactions == before + 1
+
+
+def test_write_scratch_preserves_reserved_bit(rtc):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.GP_BITS] = 0x80
+    assert rtc.write_scratch(0x7FFFFF) == 0x7FFFFF
+    assert registers[Reg.GP_BITS] == 0xFF
+    assert registers[Reg.RAM1] == 0xFF
+    assert registers[Reg.RAM2] == 0xFF
+
+
+def test_write_scratch_skips_unchanged_parts(rtc, monkeypatch):
+    writes = _record_writes(rtc, monkeypatch)
+    rtc.write_scratch(0x05, mask=0x7F)
+    assert writes == [bytes([Reg.GP_BITS, 0x05])]
+
+    writes.clear()
+    rtc.write_scratch(0x12 << 7, mask=0xFF << 7)
+    assert writes == [bytes([Reg.RAM1, 0x12, 0x00])]
+
+    writes.clear()
+    rtc.write_scratch(0x12 << 7, mask=0xFF << 7)
+    assert writes == []
+
+    with pytest.raises(ValueError):
+        rtc.write_scratch(0, mask=1 << 23)
+
+
+def test_scratch_state_fields(rtc):
+    state = ScratchState(rtc, _LAYOUT)
+    state.write(boot_phase=5, safe_mode=True, boots=20000)
+    assert state.read() == {
+        "boot_phase": 5,
+        "watchdog_reason": 0,
+        "safe_mode": True,
+        "boots": 20000,
+    }
+
+    state.write(watchdog_reason=9)
+    values = state.read()
+    assert values["watchdog_reason"] == 9
+    assert values["boot_phase"] == 5
+
+    state.clear()
+    assert not any(state.read().values())
+
+
+def test_scratch_state_invalid(rtc):
+    with pytest.raises(ValueError):
+        ScratchState(rtc, (("a", 16), ("b", 8)))
+    with pytest.raises(ValueError):
+        ScratchState(rtc, (("a", 1), ("a", 1)))
+    state = ScratchState(rtc, _LAYOUT)
+    with pytest.raises(ValueError):
+        state.write(boot_phase=8)
+    with pytest.raises(ValueError):
+        state.write(unknown=1)
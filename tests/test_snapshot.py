@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+from rv3028.registers import Control1, Control2, EventControl, Reg, Status
+from rv3028.snapshot import SNAPSHOT_SIZE, RegisterSnapshot
+
+
+def _record_writes(rtc, monkeypatch):
+    writes = []
+    original = rtc.i2c_device.write
+
+    def write(data, *, start=0, end=None):
+        writes.append(bytes(data[start:end]))
+        original(data, start=start, end=end)
+
+    monkeypatch.setattr(rtc.i2c_device, "write", write)
+    return writes
+
+
+def test_snapshot_is_one_transaction(rtc):
+    rtc.set_datetime(time.struct_time((2024, 2, 29, 13, 45, 30, 3, 60, -1)))
+    rtc.set_unix_time(1709214330)
+    rtc.set_alarm(minute=15, hour=None, weekday=None)
+    rtc.i2c_device.i2c.registers[Reg.STATUS] = Status.PORF | Status.ALARM
+
+    before = rtc.i2c_device.transactions
+    snap = rtc.snapshot()
+    assert rtc.i2c_device.transactions == before + 1
+    assert len(snap.data) == SNAPSHOT_SIZE
+
+    assert snap.datetime == (24, 2, 29, 13, 45, 30, 4)
+    assert snap.unix_time == 1709214330
+    assert snap.alarm[1:] == (None, None)
+    assert snap.field(Reg.STATUS, Status.PORF) is True
+    assert snap.field(Reg.STATUS, Status.TIMER) is False
+    assert snap.field(Reg.CONTROL2, Control2.ALARM_INT_ENABLE) is True
+    assert snap.raw(Reg.STATUS) == snap.status == Status.PORF | Status.ALARM
+
+
+def test_snapshot_into_buffer(rtc):
+    buffer = bytearray(SNAPSHOT_SIZE)
+    snap = rtc.snapshot(buffer)
+    assert snap.data is buffer
+    with pytest.raises(ValueError):
+        rtc.snapshot(bytearray(8))
+    with pytest.raises(ValueError):
+        RegisterSnapshot(bytearray(8))
+
+
+def test_snapshot_field_decodes_multibit_masks(rtc):
+    rtc.i2c_device.i2c.registers[Reg.EVENT_CONTROL] = 0x30 | 0x40
+    rtc.i2c_device.i2c.registers[Reg.CONTROL1] = 0x02
+    rtc.i2c_device.i2c.registers[Reg.TIMER_STATUS0] = 10
+    snap = rtc.snapshot()
+    assert snap.field(Reg.EVENT_CONTROL, EventControl.EVENT_FILTER) == 3
+    assert snap.field(Reg.CONTROL1, Control1.FREQ_SELECT) == 2
+    assert snap.timer_remaining == 10
+
+
+def test_restore_merges_groups_into_bursts(rtc, monkeypatch):
+    registers = rtc.i2c_device.i2c.registers
+    registers[Reg.ALARM_MINUTES : Reg.TIMER1 + 1] = [0x15, 0x80, 0x80, 0x34, 0x12]
+    registers[Reg.CONTROL1] = Control1.TIMER_REPEAT
+    registers[Reg.CONTROL2] = Control2.ALARM_INT_ENABLE | Control2.RESET
+    registers[Reg.GP_BITS] = 0x55
+    registers[Reg.CLOCK_INT_MASK] = 0x03
+    registers[Reg.EVENT_CONTROL] = EventControl.TIMESTAMP_RESET | 0x40
+    registers[Reg.RAM1 : Reg.RAM2 + 1] = [0xAA, 0xBB]
+    snap = rtc.snapshot()
+
+    for reg in range(SNAPSHOT_SIZE):
+        registers[reg] = 0
+    writes = _record_writes(rtc, monkeypatch)
+    rtc.restore(snap)
+
+    assert writes == [
+        bytes([Reg.ALARM_MINUTES, 0x15, 0x80, 0x80, 0x34, 0x12]),
+        bytes([Reg.CONTROL1, Control1.TIMER_REPEAT, Control2.ALARM_INT_ENABLE])
+        + bytes([0x55, 0x03, 0x40]),
+        bytes([Reg.RAM1, 0xAA, 0xBB]),
+    ]
+    assert registers[Reg.SECONDS] == 0
+
+
+def test_restore_selected_fields(rtc, monkeypatch):
+    rtc.set_unix_time(1234)
+    snap = rtc.snapshot()
+    rtc.set_unix_time(0)
+    writes = _record_writes(rtc, monkeypatch)
+    rtc.restore(snap, fields=("unix_time",))
+    assert len(writes) == 1
+    assert rtc.get_unix_time() == 1234
+    with pytest.raises(ValueError):
+        rtc.restore(snap, fields=("status",))
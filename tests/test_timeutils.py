@@ -0,0 +1,26 @@
+import calendar
+
+import pytest
+
+from rv3028.timeutils import epoch_seconds, is_leap_year
+
+
+@pytest.mark.parametrize(
+    "fields",
+    [
+        (1970, 1, 1, 0, 0, 0),
+        (2000, 2, 29, 12, 0, 0),
+        (2024, 3, 1, 23, 59, 58),
+        (2099, 12, 31, 23, 59, 59),
+        (2100, 3, 1, 0, 0, 0),
+    ],
+)
+def test_epoch_seconds(fields):
+    assert epoch_seconds(*fields) == calendar.timegm(fields)
+
+
+def test_is_leap_year():
+    assert is_leap_year(2024)
+    assert is_leap_year(2000)
+    assert not is_leap_year(2100)
+    assert not is_leap_year(2023)
@@ -0,0 +1,102 @@
+import pytest
+
+from rv3028.registers import Control1, Reg
+from rv3028.user_eeprom import UserEEPROM, crc8
+
+
+def test_byte_read_write(rtc):
+    rtc.write_user_eeprom(0x2A, 0x5A)
+    assert rtc.i2c_device.i2c.user_eeprom[0x2A] == 0x5A
+    assert rtc.read_user_eeprom(0x2A) == 0x5A
+    assert not rtc._get_flag(Reg.CONTROL1, Control1.EEPROM_REFRESH_DISABLE)
+
+
+def test_block_read_write(rtc):
+    rtc.write_user_eeprom_block(4, b"\x01\x02\x03")
+    buffer = bytearray(3)
+    rtc.read_user_eeprom_into(4, buffer)
+    assert buffer == b"\x01\x02\x03"
+
+
+def test_invalid_addresses(rtc):
+    with pytest.raises(ValueError):
+        rtc.read_user_eeprom(43)
+    with pytest.raises(ValueError):
+        rtc.write_user_eeprom(-1, 0)
+    with pytest.raises(ValueError):
+        rtc.write_user_eeprom(0, 0x100)
+    with pytest.raises(ValueError):
+        rtc.write_user_eeprom_block(40, b"\x00\x00\x00\x00")
+
+
+def test_store_caches_reads(rtc):
+    store = UserEEPROM(rtc)
+    rtc.i2c_device.i2c.user_eeprom[0:2] = [7, 8]
+    assert store.read(0, 2) == b"\x07\x08"
+    before = rtc.i2c_device.transactions
+    assert store.read(0, 2) == b"\x07\x08"
+    assert rtc.i2c_device.transactions == before
+
+    rtc.i2c_device.i2c.user_eeprom[0] = 9
+    store.invalidate()
+    assert store.read(0) == b"\x09"
+
+
+def test_store_skips_unchanged_bytes(rtc):
+    store = UserEEPROM(rtc)
+    assert store.write(0, b"\x01\x02\x03") == 3
+    assert store.write(0, b"\x01\x05\x03") == 1
+    assert rtc.i2c_device.i2c.eeprom_writes == 4
+    assert rtc.i2c_device.i2c.user_eeprom[0:3] == [1, 5, 3]
+
+
+def test_records_detect_corruption(rtc):
+    store = UserEEPROM(rtc)
+    assert store.read_record(0, 2) is None  # Erased
+    store.write_record(0, b"\x12\x34")
+    assert rtc.i2c_device.i2c.user_eeprom[2] == crc8(b"\x12\x34")
+    assert UserEEPROM(rtc).read_record(0, 2) == b"\x12\x34"
+
+    rtc.i2c_device.i2c.user_eeprom[1] ^= 0x01
+    assert UserEEPROM(rtc).read_record(0, 2) is None
+
+
+def test_counter_wear_levelling(rtc):
+    store = UserEEPROM(rtc)
+    counter = store.counter(10, slots=4, width=2)
+    assert counter.value == 0
+    for expected in range(1, 10):
+        assert counter.increment() == expected
+
+    # A fresh store finds the newest slot after a reboot
+    assert UserEEPROM(rtc).counter(10, slots=4, width=2).value == 9
+
+    # Every slot has been used, none more than its share
+    sequences = rtc.i2c_device.i2c.user_eeprom[10:26:4]
+    assert sorted(sequences) == [5, 6, 7, 8]
+
+
+def test_counter_sequence_wraps(rtc):
+    store = UserEEPROM(rtc)
+    counter = store.counter(0, slots=2, width=1)
+    for _ in range(300):
+        counter.increment()
+    assert UserEEPROM(rtc).counter(0, slots=2, width=1).value == 300 % 256
+
+
+def test_counter_survives_torn_write(rtc):
+    store = UserEEPROM(rtc)
+    counter = store.counter(0, slots=3)
+    counter.set(41)
+    counter.set(42)
+    # Corrupt the newest slot, as if power failed mid write
+    rtc.i2c_device.i2c.user_eeprom[5 + 1] ^= 0xFF
+    assert UserEEPROM(rtc).counter(0, slots=3).value == 41
+
+
+def test_counter_invalid(rtc):
+    store = UserEEPROM(rtc)
+    with pytest.raises(ValueError):
+        store.counter(40, slots=4)
+    with pytest.raises(ValueError):
+        store.counter(0, width=1).set(256)